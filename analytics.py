@@ -0,0 +1,151 @@
+"""Vectorized fee analytics over the whole student body.
+
+Every metric is computed with array operations over the fee snapshot's
+integer paise columns and converted to rupees only for the result. Results
+are memoized against a data version read from the per-course fee summary
+(one row per course), so repeat views cost one small query until a student
+or payment changes.
+"""
+import threading
+from datetime import date
+
+import numpy as np
+
+from models import db, Course
+from fee_snapshot import data_version
+from money import PAISE, to_rupees
+import fee_snapshot
+
+# Upper edges of the remaining-fee distribution buckets
+REMAINING_BUCKETS = [0, 5000, 10000, 25000, 50000, 100000]
+# Days since admission for the aging of outstanding fees
+AGING_BUCKETS = [90, 180, 365, 730]
+
+_memo = {'version': None, 'value': None}
+_memo_lock = threading.Lock()
+
+
+def load_arrays():
+    """int64 paise columns (and datetime64 admission days) viewed from the fee snapshot."""
+    return fee_snapshot.current().numpy()
+
+
+def _rate(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.zeros(np.shape(numerator)), where=denominator > 0)
+
+
+def per_course(data, courses):
+    size = max(courses) + 1 if courses else 1
+    course_id = data['course_id']
+    count = np.bincount(course_id, minlength=size)
+    billed = np.bincount(course_id, weights=data['total'], minlength=size)
+    paid = np.bincount(course_id, weights=data['paid'], minlength=size)
+    remaining = np.bincount(course_id, weights=data['remaining'], minlength=size)
+    discount = np.bincount(course_id, weights=data['list_fee'] - data['total'], minlength=size)
+    discounted = np.bincount(course_id, weights=(data['total'] < data['list_fee']), minlength=size)
+    collection_rate = _rate(paid, billed)
+    return [{
+        'course_id': cid,
+        'course': name,
+        'students': int(count[cid]),
+        'billed': to_rupees(billed[cid]),
+        'collected': to_rupees(paid[cid]),
+        'pending': to_rupees(remaining[cid]),
+        'collection_rate': round(float(collection_rate[cid]), 4),
+        'discounted_students': int(discounted[cid]),
+        'discount_total': to_rupees(discount[cid]),
+    } for cid, name in courses.items()]
+
+
+def remaining_distribution(data):
+    remaining = data['remaining']
+    edges = np.array(REMAINING_BUCKETS + [np.inf]) * PAISE
+    # Bucket 0 is "fully paid"; bucket i covers (edges[i-1], edges[i]]
+    bucket = np.searchsorted(edges, remaining, side='left')
+    counts = np.bincount(bucket, minlength=len(edges))
+    amounts = np.bincount(bucket, weights=remaining, minlength=len(edges))
+    labels = ['paid'] + [f"{low + 1}-{high}" for low, high in zip(REMAINING_BUCKETS[:-1], REMAINING_BUCKETS[1:])]
+    labels.append(f">{REMAINING_BUCKETS[-1]}")
+    pending = remaining[remaining > 0]
+    percentiles = np.percentile(pending, [50, 90, 99]) if pending.size else np.zeros(3)
+    return {
+        'buckets': [{'label': label, 'students': int(n), 'amount': to_rupees(a)}
+                    for label, n, a in zip(labels, counts, amounts)],
+        'pending_students': int(pending.size),
+        'median': round(float(percentiles[0]) / PAISE, 2),
+        'p90': round(float(percentiles[1]) / PAISE, 2),
+        'p99': round(float(percentiles[2]) / PAISE, 2),
+        'mean': round(float(pending.mean()) / PAISE, 2) if pending.size else 0.0,
+    }
+
+
+def defaulter_aging(data, today=None):
+    """Outstanding fees grouped by days since admission."""
+    today = np.datetime64(today or date.today(), 'D')
+    owing = data['remaining'] > 0
+    age = (today - data['admitted'][owing]).astype(np.int64)
+    remaining = data['remaining'][owing]
+    bucket = np.searchsorted(np.array(AGING_BUCKETS), age, side='left')
+    counts = np.bincount(bucket, minlength=len(AGING_BUCKETS) + 1)
+    amounts = np.bincount(bucket, weights=remaining, minlength=len(AGING_BUCKETS) + 1)
+    labels = [f"{low}-{high} days" for low, high in zip([0] + AGING_BUCKETS[:-1], AGING_BUCKETS)]
+    labels.append(f">{AGING_BUCKETS[-1]} days")
+    return [{'label': label, 'students': int(n), 'amount': to_rupees(a)}
+            for label, n, a in zip(labels, counts, amounts)]
+
+
+def discount_impact(data):
+    discount = data['list_fee'] - data['total']
+    discounted = discount > 0
+    rate = _rate(discount, data['list_fee'])
+    return {
+        'list_value': to_rupees(data['list_fee'].sum()),
+        'billed': to_rupees(data['total'].sum()),
+        'discount_total': to_rupees(discount[discounted].sum()),
+        'discounted_students': int(discounted.sum()),
+        'average_discount_rate': round(float(rate[discounted].mean()), 4) if discounted.any() else 0.0,
+    }
+
+
+def admission_cohorts(data):
+    """Students, billing and collection per admission month."""
+    months = data['admitted'].astype('datetime64[M]')
+    cohorts, index = np.unique(months, return_inverse=True)
+    count = np.bincount(index, minlength=len(cohorts))
+    billed = np.bincount(index, weights=data['total'], minlength=len(cohorts))
+    paid = np.bincount(index, weights=data['paid'], minlength=len(cohorts))
+    rate = _rate(paid, billed)
+    return [{
+        'cohort': str(cohort),
+        'students': int(count[i]),
+        'billed': to_rupees(billed[i]),
+        'collected': to_rupees(paid[i]),
+        'collection_rate': round(float(rate[i]), 4),
+    } for i, cohort in enumerate(cohorts)]
+
+
+def compute():
+    data = load_arrays()
+    courses = dict(db.session.query(Course.id, Course.name).order_by(Course.id).all())
+    total_billed = data['total'].sum()
+    return {
+        'students': int(data['total'].size),
+        'collection_rate': round(float(data['paid'].sum() / total_billed), 4) if total_billed else 0.0,
+        'courses': per_course(data, courses),
+        'remaining_distribution': remaining_distribution(data),
+        'defaulter_aging': defaulter_aging(data),
+        'discount_impact': discount_impact(data),
+        'cohorts': admission_cohorts(data),
+    }
+
+
+def fee_analytics():
+    """All metrics, recomputed only when data_version() changes."""
+    version = (data_version(), date.today())
+    with _memo_lock:
+        if _memo['version'] == version:
+            return _memo['value']
+    value = compute()
+    with _memo_lock:
+        _memo['version'], _memo['value'] = version, value
+    return value
@@ -0,0 +1,137 @@
+"""Versioned JSON API for course and student lookups: /api/v1/...
+
+Responses carry an ETag, and a Last-Modified where the data has a natural
+timestamp, so polling clients can revalidate and get a 304 back. The course
+catalogue comes from the in-memory course cache without touching the
+database.
+"""
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_login import login_required
+from sqlalchemy import func
+
+from models import db, Payment, Student
+from listing import DEFAULT_PER_PAGE, course_students_page
+from routing import read_replica
+from search import search_students
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+
+STUDENT_FIELDS = ('id', 'enrollment_number', 'first_name', 'last_name', 'gender', 'phone', 'email',
+                  'admission_date', 'course_id', 'total_fees', 'paid_fees', 'remaining_fees')
+
+
+def course_cache():
+    return current_app.extensions['course_cache']
+
+
+def student_dict(student):
+    data = {field: getattr(student, field) for field in STUDENT_FIELDS}
+    data['admission_date'] = student.admission_date.isoformat() if student.admission_date else None
+    return data
+
+
+def conditional(response, last_modified=None):
+    if not response.get_etag()[0]:
+        response.add_etag()
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def error(message, status):
+    return jsonify({'error': message}), status
+
+
+@api.route('/courses')
+@login_required
+def courses():
+    _, body, etag, loaded_at = course_cache().snapshot()
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return conditional(response, loaded_at)
+
+
+@api.route('/courses/<int:course_id>')
+@login_required
+def course(course_id):
+    course = course_cache().get(course_id)
+    if course is None:
+        return error('Course not found', 404)
+    return conditional(jsonify(course))
+
+
+@api.route('/courses/<int:course_id>/students')
+@login_required
+@read_replica
+def course_students(course_id):
+    if course_cache().get(course_id) is None:
+        return error('Course not found', 404)
+    try:
+        students, next_cursor = course_students_page(
+            course_id,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('per_page', DEFAULT_PER_PAGE, type=int))
+    except ValueError as e:
+        return error(str(e), 400)
+    return conditional(jsonify({
+        'students': [student._asdict() for student in students],
+        'next_cursor': next_cursor
+    }))
+
+
+@api.route('/students')
+@login_required
+@read_replica
+def student_by_enrollment():
+    enrollment_number = request.args.get('enrollment_number')
+    if not enrollment_number:
+        return error('enrollment_number is required', 400)
+    student = Student.query.filter_by(enrollment_number=enrollment_number).first()
+    if student is None:
+        return error('Student not found', 404)
+    return conditional(jsonify(student_dict(student)))
+
+
+@api.route('/students/<int:student_id>')
+@login_required
+@read_replica
+def student(student_id):
+    student = db.session.get(Student, student_id)
+    if student is None:
+        return error('Student not found', 404)
+    return conditional(jsonify(student_dict(student)))
+
+
+@api.route('/students/<int:student_id>/fees')
+@login_required
+@read_replica
+def fee_status(student_id):
+    row = db.session.query(
+        Student.id, Student.enrollment_number, Student.total_fees, Student.paid_fees, Student.remaining_fees,
+        func.count(Payment.id).label('payments'), func.max(Payment.paid_at).label('last_payment_at')
+    ).outerjoin(Payment, Payment.student_id == Student.id).filter(
+        Student.id == student_id
+    ).group_by(Student.id).first()
+    if row is None:
+        return error('Student not found', 404)
+    status = row._asdict()
+    last_payment_at = status['last_payment_at']
+    status['last_payment_at'] = last_payment_at.isoformat() if last_payment_at else None
+    # No Last-Modified: discounts and fee revisions change the balance without a new payment
+    return conditional(jsonify(status))
+
+
+@api.route('/search')
+@login_required
+@read_replica
+def search():
+    term = (request.args.get('q') or '').strip()
+    if not term:
+        return error('q is required', 400)
+    # LIMIT -1 means no limit to SQLite, so clamp from below as well
+    limit = max(1, min(request.args.get('limit', current_app.config['SEARCH_RESULT_LIMIT'], type=int),
+                       current_app.config['SEARCH_RESULT_LIMIT']))
+    students = search_students(term, limit=limit)
+    return conditional(jsonify({'students': [student_dict(student) for student in students]}))
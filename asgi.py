@@ -0,0 +1,18 @@
+"""ASGI entry point for serving the app under an asyncio server.
+
+    pip install asgiref uvicorn
+    uvicorn asgi:application --workers 4
+
+Requests are handed to the WSGI app on asgiref's thread pool. The event loop
+keeps slow or idle clients, such as kiosks and portals polling fee status,
+from each holding a worker thread while they wait. Most of their polls end
+in a 304 from the cached course catalogue or an unchanged ETag.
+"""
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError as e:
+    raise RuntimeError('Serving over ASGI needs asgiref: pip install asgiref uvicorn') from e
+
+from app import app
+
+application = WsgiToAsgi(app)
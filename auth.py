@@ -0,0 +1,87 @@
+"""Sign-in, sign-out and admin accounts."""
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask_login import login_required, login_user, logout_user
+
+from models import db, Admin
+from extensions import admin_identities, password_hasher
+from passwords import LoginBusy
+
+bp = Blueprint('auth', __name__)
+
+
+@bp.route('/')
+def index():
+    return redirect(url_for('auth.login'))
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        admin = Admin.query.filter_by(username=username).first()
+
+        try:
+            if admin is None:
+                valid = password_hasher.verify_missing(password or '')
+            else:
+                valid = password_hasher.verify(admin.password_hash, password or '')
+        except LoginBusy:
+            flash('The server is busy signing in other users, please try again', 'danger')
+            return render_template('login.html'), 503
+
+        if valid:
+            if password_hasher.needs_rehash(admin.password_hash):
+                try:
+                    admin.password_hash = password_hasher.hash(password)
+                    db.session.commit()
+                except LoginBusy:
+                    # The old hash still works; it is upgraded on a later login
+                    pass
+            login_user(admin)
+            return redirect(url_for('dashboard.dashboard'))
+        flash('Invalid username or password')
+    return render_template('login.html')
+
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for('auth.login'))
+
+@bp.route('/add_admin', methods=['GET', 'POST'])
+@login_required
+def add_admin():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+
+        if not username or not password:
+            flash('Please fill in all fields', 'danger')
+            return redirect(url_for('auth.add_admin'))
+
+        if password != confirm_password:
+            flash('Passwords do not match', 'danger')
+            return redirect(url_for('auth.add_admin'))
+
+        if Admin.query.filter_by(username=username).first():
+            flash('Username already exists', 'danger')
+            return redirect(url_for('auth.add_admin'))
+
+        try:
+            password_hash = password_hasher.hash(password)
+        except LoginBusy:
+            flash('The server is busy signing in other users, please try again', 'danger')
+            return redirect(url_for('auth.add_admin'))
+
+        admin = Admin(
+            username=username,
+            password_hash=password_hash
+        )
+        db.session.add(admin)
+        db.session.commit()
+        admin_identities.invalidate()
+        flash('Admin added successfully!', 'success')
+        return redirect(url_for('dashboard.dashboard'))
+
+    return render_template('add_admin.html')
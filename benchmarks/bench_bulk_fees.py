@@ -0,0 +1,131 @@
+"""Bulk fee operations: one set-based statement vs saving students one at a time.
+
+Usage: python benchmarks/bench_bulk_fees.py [--students 20000] [--payments 5000]
+
+Times a 10% discount on every student and a bank batch of payments, first
+through the per-row ORM path (load each student, change it, flush, keep the
+summary in step) and then through bulk_fees on a fresh copy of the same
+database. Exits non-zero if the two paths leave balances differing by even a
+paisa or the fee summary drifts.
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func
+
+from app import app
+from models import db, Payment, Student
+from bulk_fees import apply_discount, post_payment_batch
+import money
+import seed
+import summary
+
+PERCENT = 10
+
+
+def per_row(batch):
+    start = time.perf_counter()
+    for student in Student.query.all():
+        previous = summary.student_values(student)
+        student.total_fees = money.discounted(student.total_fees, PERCENT)
+        student.remaining_fees = max(money.rupees(student.total_fees - (student.paid_fees or 0)), 0)
+        summary.apply_students([previous], sign=-1)
+        summary.apply_students([summary.student_values(student)])
+    db.session.commit()
+    discount = time.perf_counter() - start
+
+    start = time.perf_counter()
+    students = {student.enrollment_number: student for student in
+                Student.query.filter(Student.enrollment_number.in_({number for number, _ in batch}))}
+    for number, amount in batch:
+        student = students[number]
+        if amount > student.remaining_fees:
+            continue
+        student.paid_fees = (student.paid_fees or 0) + amount
+        student.remaining_fees -= amount
+        db.session.add(Payment(student_id=student.id, amount=amount))
+        summary.apply_payment(student.id, amount)
+    db.session.commit()
+    return discount, time.perf_counter() - start
+
+
+def set_based(batch):
+    result = apply_discount(PERCENT, pending_only=True)
+    rows = ((line, {'enrollment_number': number, 'amount': str(amount)})
+            for line, (number, amount) in enumerate(batch, start=2))
+    payments = post_payment_batch(rows)
+    return result.elapsed, payments.elapsed
+
+
+def state():
+    return db.session.query(func.sum(Student.total_fees), func.sum(Student.paid_fees),
+                            func.sum(Student.remaining_fees), func.count(Payment.id)).outerjoin(
+        Payment, Payment.student_id == Student.id).one()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--payments', type=int, default=5000, help='Payments in the bank batch.')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    source = os.path.join(workdir, 'source.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + source
+    with app.app_context():
+        db.create_all()
+        seed.seed_courses()
+        seed.seed_students(args.students, as_of=date(2026, 9, 1))
+        # Every student still owes something, so the ORM and set-based discounts touch the same rows
+        db.session.query(Student).filter(Student.remaining_fees <= 0).delete(synchronize_session=False)
+        summary.rebuild()
+        db.session.commit()
+        # One payment each for a sample of students; both paths skip any above the balance
+        rng = random.Random(42)
+        numbers = [number for (number,) in db.session.query(Student.enrollment_number)]
+        batch = [(number, float(rng.randint(1, 100)))
+                 for number in rng.sample(numbers, min(args.payments, len(numbers)))]
+        students = len(numbers)
+        db.session.remove()
+        db.engine.dispose()
+
+    results, states = {}, {}
+    for label, run in (('per-row ORM', per_row), ('set-based', set_based)):
+        path = os.path.join(workdir, label.replace(' ', '_') + '.db')
+        src, dst = sqlite3.connect(source), sqlite3.connect(path)
+        src.backup(dst)
+        src.close()
+        dst.close()
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+        with app.app_context():
+            results[label] = run(batch)
+            states[label] = state()
+            drift = summary.check()
+            db.session.remove()
+            db.engine.dispose()
+        print(f'{label:>12}: discount {results[label][0] * 1000:8.1f} ms, '
+              f'{len(batch)} payments {results[label][1] * 1000:8.1f} ms'
+              f'{"" if not drift else f"  (summary drift in {len(drift)} columns)"}')
+        if drift:
+            sys.exit(1)
+
+    orm, bulk = results['per-row ORM'], results['set-based']
+    print(f'{students} students: discount {orm[0] / bulk[0]:.1f}x faster, payments {orm[1] / bulk[1]:.1f}x faster')
+    same = states['per-row ORM'] == states['set-based']
+    if not same:
+        print(f'  balances differ: {states["per-row ORM"]} != {states["set-based"]}')
+    shutil.rmtree(workdir)
+    sys.exit(0 if same else 1)
+
+
+if __name__ == '__main__':
+    main()
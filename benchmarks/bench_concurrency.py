@@ -0,0 +1,117 @@
+"""Concurrent reads and writes against SQLite: default settings vs the tuned profile.
+
+Usage: python benchmarks/bench_concurrency.py [--readers 8] [--writers 4] [--seconds 10] [--students 20000]
+
+Readers page through pending fees and the course summary while writers post
+payments. The "default" setup is what the app used before config profiles
+(rollback journal, synchronous=FULL, no pool); "tuned" is the production
+profile (WAL, synchronous=NORMAL, mmap, larger cache, busy timeout, pooled
+connections). Each setup runs in its own process on a fresh database.
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SETUPS = ('default', 'tuned')
+
+
+def run_setup(setup, args):
+    os.environ['APP_PROFILE'] = 'production'
+    from sqlalchemy.exc import OperationalError
+
+    from app import app
+    from models import db, Student
+    from listing import pending_fees_page
+    from payments import PaymentError, post_payment
+    import database
+    import seed
+    import summary
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    if setup == 'default':
+        app.config.update(SQLALCHEMY_ENGINE_OPTIONS={}, SQLITE_JOURNAL_MODE='DELETE', SQLITE_SYNCHRONOUS='FULL',
+                          SQLITE_BUSY_TIMEOUT=None, SQLITE_CACHE_SIZE=None, SQLITE_MMAP_SIZE=None)
+    else:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database.engine_options(app.config)
+
+    with app.app_context():
+        db.create_all()
+        seed.seed_courses()
+        seed.seed_students(args.students, as_of=date(2026, 9, 1))
+        student_ids = [student_id for (student_id,) in db.session.query(Student.id)]
+
+    counts = {'reads': 0, 'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + args.seconds
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def reader():
+        with app.app_context():
+            while time.monotonic() < stop:
+                try:
+                    pending_fees_page(None, 50)
+                    summary.course_summaries()
+                    bump('reads')
+                except OperationalError:
+                    db.session.rollback()
+                    bump('locked')
+                finally:
+                    db.session.remove()
+
+    def writer(rng):
+        with app.app_context():
+            while time.monotonic() < stop:
+                try:
+                    post_payment(rng.choice(student_ids), float(rng.randint(1, 50)))
+                    bump('writes')
+                except PaymentError:
+                    pass
+                except OperationalError:
+                    bump('locked')
+                finally:
+                    db.session.remove()
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(random.Random(i),)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f'{setup:<8}{counts["reads"] / args.seconds:>10.1f}{counts["writes"] / args.seconds:>10.1f}'
+          f'{counts["locked"]:>8}', flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--setup', choices=SETUPS, help='Run a single setup in this process.')
+    args = parser.parse_args()
+
+    if args.setup:
+        run_setup(args.setup, args)
+        return
+
+    print(f'{args.readers} readers, {args.writers} writers, {args.seconds:g}s each')
+    print(f'{"setup":<8}{"reads/s":>10}{"writes/s":>10}{"locked":>8}', flush=True)
+    for setup in SETUPS:
+        subprocess.run([sys.executable, __file__, '--setup', setup] + sys.argv[1:], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Concurrent enrollment number allocation: duplicate check and throughput.
+
+Usage: python benchmarks/bench_enrollment.py [--threads 8] [--per-thread 250] [--block 100]
+
+Exits non-zero if any number is handed out twice or the counter skips.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from enrollment import allocate_enrollment_numbers
+from models import db
+
+
+def run(threads, per_thread, block):
+    allocated = []
+    lock = threading.Lock()
+    errors = []
+
+    def worker():
+        numbers = []
+        try:
+            with app.app_context():
+                for _ in range(per_thread):
+                    numbers.extend(allocate_enrollment_numbers(block, year=2030))
+        except Exception as e:
+            errors.append(e)
+        with lock:
+            allocated.extend(numbers)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    expected = threads * per_thread * block
+    reservations = threads * per_thread
+    print(f'block={block:<4d} {reservations} reservations, {len(allocated)} numbers in {elapsed:.2f} s '
+          f'({reservations / elapsed:,.0f} reservations/s, {len(allocated) / elapsed:,.0f} numbers/s)')
+    if errors:
+        print(f'  {len(errors)} worker errors, first: {errors[0]!r}')
+        return False
+    if len(set(allocated)) != len(allocated):
+        print(f'  DUPLICATES: {len(allocated) - len(set(allocated))}')
+        return False
+    if len(allocated) != expected:
+        print(f'  expected {expected} numbers')
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--per-thread', type=int, default=250)
+    parser.add_argument('--block', type=int, default=100)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    with app.app_context():
+        db.create_all()
+
+    ok = run(args.threads, args.per_thread, 1)
+    ok = run(args.threads, args.per_thread // 10 or 1, args.block) and ok
+    os.remove(path)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Bulk CSV import throughput versus one-at-a-time ORM inserts.
+
+Usage: python benchmarks/bench_import.py [--rows 50000] [--batch-size 1000]
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from importer import StudentImporter, import_students
+from models import db, Course, Student
+import seed
+
+FIELDS = ['first_name', 'last_name', 'date_of_birth', 'gender', 'father_name', 'mother_name',
+          'address', 'phone', 'email', 'course_id', 'discount']
+
+
+def make_csv(rows, rng, prefix):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for i in range(rows):
+        writer.writerow({
+            'first_name': rng.choice(['Aarav', 'Neha', 'Rahul', 'Priya']),
+            'last_name': rng.choice(['Sharma', 'Patel', 'Iyer']),
+            'date_of_birth': '2005-03-14',
+            'gender': rng.choice(['Male', 'Female']),
+            'father_name': 'Father',
+            'mother_name': 'Mother',
+            'address': 'Address',
+            'phone': '+919999999999',
+            'email': f'{prefix}{i}@example.com',
+            'course_id': rng.randint(1, 11),
+            'discount': rng.choice([0, 0, 10]),
+        })
+    out.seek(0)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--orm-rows', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    with app.app_context():
+        db.create_all()
+        seed.seed_courses()
+
+        result = import_students(make_csv(args.rows, rng, 'bulk'), batch_size=args.batch_size)
+        print(f'bulk import: {result.inserted} rows in {result.elapsed:.2f} s '
+              f'({result.rows_per_second:,.0f} rows/s, {len(result.errors)} errors)')
+
+        # The add_student path: existence check, course lookup and a commit per row
+        start = time.perf_counter()
+        importer = StudentImporter()
+        for line, row in enumerate(csv.DictReader(make_csv(args.orm_rows, rng, 'orm')), start=2):
+            mapping = importer.validate(row, date.today())
+            Student.query.filter_by(email=mapping['email']).first()
+            db.session.get(Course, mapping['course_id'])
+            mapping['enrollment_number'] = f'ORM{line:08d}'
+            db.session.add(Student(**mapping))
+            db.session.commit()
+        elapsed = time.perf_counter() - start
+        print(f'per-row ORM: {args.orm_rows} rows in {elapsed:.2f} s ({args.orm_rows / elapsed:,.0f} rows/s)')
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Query plans and timings for the hot Student queries, before and after migration 1.
+
+Usage: python benchmarks/bench_indexes.py [--students 100000]
+
+Builds a throwaway SQLite database from the seed generator, drops the
+Student secondary indexes to mimic a pre-migration database, measures, then
+applies the migrations and measures again.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+
+from app import app
+from listing import course_students_page, pending_fees_page
+from models import db, Student
+import migrations
+import seed
+
+
+def hot_queries():
+    first_page, cursor = pending_fees_page(limit=50)
+    return {
+        'fee_dashboard first page': lambda: pending_fees_page(limit=50),
+        'fee_dashboard next page': lambda: pending_fees_page(cursor=cursor, limit=50),
+        'course students page': lambda: course_students_page(3, limit=50),
+        'pending fee count': lambda: Student.query.filter(Student.remaining_fees > 0).count(),
+        'name search': lambda: Student.query.filter(
+            Student.first_name.ilike('%zachariah%') | Student.last_name.ilike('%zachariah%')
+        ).limit(50).all(),
+    }
+
+
+def measure(label, repeat):
+    print(f'\n== {label} ==')
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    for name, query in hot_queries().items():
+        captured.clear()
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        query()
+        event.remove(db.engine, 'before_cursor_execute', capture)
+        statement, parameters = captured[-1]
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            query()
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+
+        raw = db.engine.raw_connection()
+        try:
+            rows = raw.execute('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+        finally:
+            raw.close()
+        print(f'{name:28s} {elapsed:9.2f} ms  | ' + '; '.join(row[-1] for row in rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    with app.app_context():
+        db.create_all()
+        for index in Student.__table__.indexes:
+            index.drop(db.engine)
+        seed.seed_courses()
+        elapsed = seed.seed_students(args.students, seed=args.seed, as_of=date(2026, 9, 1))
+        print(f'Seeded {args.students} students into {path} in {elapsed:.2f} s')
+
+        measure('before migration', args.repeat)
+        start = time.perf_counter()
+        applied = migrations.upgrade()
+        print(f'\nApplied migrations {applied} in {time.perf_counter() - start:.2f} s')
+        db.session.execute(text('ANALYZE'))
+        measure('after migration', args.repeat)
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
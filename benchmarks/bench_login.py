@@ -0,0 +1,78 @@
+"""Login throughput: verified logins/sec and per core at different hash costs.
+
+Usage: python benchmarks/bench_login.py [--logins 200] [--clients 16] [--iterations 260000 100000 50000]
+
+A burst of clients signs in at once through the Flask test client. Hash
+verification goes through the bounded password pool, so the pool size caps
+how many cores the burst can use; rejected (busy) attempts are counted too.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from models import db, Admin
+from extensions import password_hasher
+
+
+def burst(logins, clients):
+    ok, busy = [0], [0]
+    lock = threading.Lock()
+
+    def client_loop(count):
+        client = app.test_client()
+        for _ in range(count):
+            status = client.post('/login', data={'username': 'bench', 'password': 'bench'}).status_code
+            with lock:
+                if status == 302:
+                    ok[0] += 1
+                elif status == 503:
+                    busy[0] += 1
+
+    per_client = max(1, logins // clients)
+    threads = [threading.Thread(target=client_loop, args=(per_client,)) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return ok[0], busy[0], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Password pool size.')
+    parser.add_argument('--iterations', type=int, nargs='+', default=[260000, 100000, 50000])
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    app.config['PASSWORD_HASH_WORKERS'] = args.workers
+    app.config['PASSWORD_HASH_QUEUE'] = args.clients
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+
+    print(f'{args.clients} clients, {args.workers} hash workers, {cores} cores')
+    print(f'{"iterations":>10}{"ok":>7}{"busy":>6}{"logins/s":>10}{"per core":>10}')
+    for iterations in args.iterations:
+        app.config['PASSWORD_HASH_ITERATIONS'] = iterations
+        password_hasher.init_app(app)
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add(Admin(username='bench', password_hash=password_hasher.hash('bench')))
+            db.session.commit()
+        ok, busy, elapsed = burst(args.logins, args.clients)
+        rate = ok / elapsed
+        print(f'{iterations:>10}{ok:>7}{busy:>6}{rate:>10.1f}{rate / min(cores, args.workers):>10.1f}')
+        password_hasher.executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
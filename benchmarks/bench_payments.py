@@ -0,0 +1,96 @@
+"""Concurrent fee payments: ledger consistency check and payments/sec.
+
+Usage: python benchmarks/bench_payments.py [--threads 8] [--payments 500] [--students 20]
+
+Every thread pays small amounts against the same few students, so payments
+constantly race on the same rows. Exits non-zero if the ledger and the
+student balances disagree or any balance goes negative.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func
+
+from app import app
+from models import db, Payment, Student
+from payments import PaymentError, post_payment
+import seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--payments', type=int, default=500, help='Payments per thread.')
+    parser.add_argument('--students', type=int, default=20, help='Size of the contended student set.')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 30}}
+    with app.app_context():
+        db.create_all()
+        seed.seed_courses()
+        seed.seed_students(args.students, as_of=date(2026, 9, 1))
+        student_ids = [student_id for (student_id,) in db.session.query(Student.id)]
+        before = db.session.query(func.sum(Student.paid_fees), func.sum(Student.remaining_fees)).one()
+        ledger_before = db.session.query(func.coalesce(func.sum(Payment.amount), 0)).scalar()
+
+    accepted, rejected, errors = [], [], []
+
+    def worker(rng):
+        with app.app_context():
+            for _ in range(args.payments):
+                amount = float(rng.randint(1, 500))
+                try:
+                    post_payment(rng.choice(student_ids), amount)
+                    accepted.append(amount)
+                except PaymentError:
+                    rejected.append(amount)
+                except Exception as e:
+                    errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(random.Random(i),)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        after = db.session.query(func.sum(Student.paid_fees), func.sum(Student.remaining_fees)).one()
+        ledger = db.session.query(func.sum(Payment.amount)).scalar() - ledger_before
+        negative = Student.query.filter(Student.remaining_fees < 0).count()
+
+    attempted = len(accepted) + len(rejected) + len(errors)
+    print(f'{attempted} payments from {args.threads} threads on {args.students} students in {elapsed:.2f} s '
+          f'({attempted / elapsed:,.0f} payments/s; {len(accepted)} accepted, {len(rejected)} rejected, '
+          f'{len(errors)} errors)')
+    ok = not errors and not negative
+    checks = [
+        ('ledger total == accepted payments', ledger, sum(accepted)),
+        ('paid_fees delta == ledger total', after[0] - before[0], ledger),
+        ('remaining_fees delta == -ledger total', before[1] - after[1], ledger),
+    ]
+    for label, actual, expected in checks:
+        match = abs(actual - expected) < 1e-6
+        ok = ok and match
+        print(f'  {label}: {"ok" if match else f"MISMATCH {actual} != {expected}"}')
+    if negative:
+        print(f'  {negative} students with negative remaining fees')
+    if errors:
+        print(f'  first error: {errors[0]!r}')
+    os.remove(path)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+"""Route benchmark suite: latency percentiles, throughput and queries per request.
+
+Usage:
+    python benchmarks/bench_routes.py [--students 1000 10000 100000] [--requests 200]
+    python benchmarks/bench_routes.py --server --workers 4 --clients 8
+    python benchmarks/bench_routes.py --save-baseline
+    python benchmarks/bench_routes.py --threshold 0.3
+
+Each dataset size is seeded into a fresh SQLite database. Every route is then
+exercised through the Flask test client, or with --server through a local
+pre-forked set of Werkzeug server processes driven by concurrent HTTP clients. Results
+are compared with benchmarks/baseline.json. The run fails when a route's p95
+latency grows by more than --threshold, or when it averages at least half a
+query per request more than the baseline: an N+1 adds one or more, while
+cache refreshes only move the average by a few hundredths. Query counts are
+only measured with the test client.
+
+The repository ships without its Jinja templates, so templates that are
+missing are replaced with minimal ones that touch the same context values.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+QUERY_TOLERANCE = 0.5
+AS_OF = date(2026, 9, 1)
+USERNAME, PASSWORD = 'bench', 'bench-password'
+
+ROUTES = ('login', 'dashboard', 'fee_dashboard', 'view_students', 'view_course_students', 'search_student',
+          'add_student', 'pay_fees', 'update_student', 'generate_report')
+
+STUB_TEMPLATES = {
+    'login.html': 'login',
+    'dashboard.html': '{{ total_students }} {{ total_fees_collected }} {{ analytics|length }}',
+    'fee_dashboard.html': '{% for s in students %}{{ s.first_name }} {{ s.remaining_fees }}{% endfor %}'
+                          '{% for p in recent_payments %}{{ p.amount }}{% endfor %}',
+    'view_students.html': '{% for c in courses %}{{ c.name }}{% for s in c.students %}{{ s.first_name }}'
+                          '{% endfor %}{% endfor %}',
+    'course_students.html': '{{ course.name }}{% for s in students %}{{ s.first_name }}{% endfor %}',
+    'search_student.html': 'search',
+    'search_results.html': '{% for s in students %}{{ s.first_name }}{% endfor %}',
+    'student_details.html': '{{ student.first_name }} {{ student.course.name }}',
+    'add_student.html': '{% for c in courses %}{{ c.name }}{% endfor %}',
+    'update_student.html': '{{ student.first_name }}{% for c in courses %}{{ c.name }}{% endfor %}',
+    'pay_fees.html': '{{ student.remaining_fees }}',
+    'add_admin.html': 'add admin',
+    'student_report.html': '{{ student.first_name }}',
+}
+
+
+def install_template_stubs(app):
+    from jinja2 import ChoiceLoader, DictLoader
+    app.jinja_loader = ChoiceLoader([app.jinja_loader, DictLoader(STUB_TEMPLATES)])
+
+
+def seed_database(path, students):
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+    os.environ['REPORT_DIR'] = os.path.join(os.path.dirname(path), 'reports')
+    from app import app
+    from models import db, Admin, Course, Student
+    from extensions import password_hasher
+    import migrations
+    import seed
+
+    with app.app_context():
+        db.create_all()
+        migrations.upgrade()
+        db.session.add(Admin(username=USERNAME, password_hash=password_hasher.hash(PASSWORD)))
+        db.session.commit()
+        seed.seed_courses()
+        seed.seed_students(students, as_of=AS_OF)
+        return {
+            'student_ids': [student_id for (student_id,) in db.session.query(Student.id)],
+            'course_ids': [course_id for (course_id,) in db.session.query(Course.id)],
+            'names': [name for (name,) in db.session.query(Student.first_name).distinct().limit(50)],
+        }
+
+
+def student_form(i, course_id, token):
+    return {
+        'first_name': f'Bench{i}', 'last_name': 'Student', 'date_of_birth': '2005-01-01', 'gender': 'Female',
+        'father_name': 'Father', 'mother_name': 'Mother', 'address': 'Address', 'phone': '9000000000',
+        'email': f'bench.{token}.{i}@example.com', 'course_id': str(course_id),
+    }
+
+
+def make_request(route, i, data, rng, token):
+    """Return (method, path, form, headers) for the i-th request to route."""
+    if route == 'login':
+        return 'POST', '/login', {'username': USERNAME, 'password': PASSWORD}, {}
+    if route == 'dashboard':
+        return 'GET', '/dashboard', None, {}
+    if route == 'fee_dashboard':
+        return 'GET', '/fee_dashboard', None, {}
+    if route == 'view_students':
+        return 'GET', f'/view_students?page={rng.randint(1, 3)}', None, {}
+    if route == 'view_course_students':
+        return 'GET', f'/view_course_students/{rng.choice(data["course_ids"])}', None, {}
+    if route == 'search_student':
+        return 'GET', '/search_student?' + urllib.parse.urlencode({'name': rng.choice(data['names'])}), None, {}
+    if route == 'add_student':
+        return 'POST', '/add_student', student_form(i, rng.choice(data['course_ids']), token), {}
+    if route == 'pay_fees':
+        return 'POST', f'/pay_fees/{rng.choice(data["student_ids"])}', {'amount': '1'}, {}
+    if route == 'update_student':
+        student_id = rng.choice(data['student_ids'])
+        form = student_form(i, '', f'{token}u')
+        del form['course_id']
+        return 'POST', f'/update_student/{student_id}', form, {}
+    if route == 'generate_report':
+        return 'GET', '/generate_report?kind=project', None, {'Accept': 'application/json'}
+    raise ValueError(route)
+
+
+def summarize(latencies, elapsed, queries=None, errors=0):
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    result = {
+        'p50_ms': round(cuts[49] * 1000, 3),
+        'p95_ms': round(cuts[94] * 1000, 3),
+        'p99_ms': round(cuts[98] * 1000, 3),
+        'rps': round(len(latencies) / elapsed, 1),
+        'errors': errors,
+    }
+    if queries is not None:
+        result['queries'] = round(queries / len(latencies), 2)
+    return result
+
+
+def run_test_client(data, args):
+    from sqlalchemy import event
+    from app import app
+    from models import db
+
+    install_template_stubs(app)
+    queries = [0]
+    caller = threading.get_ident()
+
+    def record(*_):
+        # Background report jobs run on other threads and are not part of the request
+        if threading.get_ident() == caller:
+            queries[0] += 1
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+
+    client = app.test_client()
+    client.post('/login', data={'username': USERNAME, 'password': PASSWORD})
+    rng = random.Random(1)
+    token = f'{time.time_ns():x}'
+    results = {}
+    for route in ROUTES:
+        latencies, errors = [], 0
+        count = max(2, args.requests // 10 if route == 'login' else args.requests)
+        queries[0] = 0
+        started = time.perf_counter()
+        for i in range(count):
+            method, path, form, headers = make_request(route, i, data, rng, token)
+            begin = time.perf_counter()
+            response = client.open(path, method=method, data=form, headers=headers)
+            latencies.append(time.perf_counter() - begin)
+            if response.status_code >= 400:
+                errors += 1
+        results[route] = summarize(latencies, time.perf_counter() - started, queries[0], errors)
+    return results
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def http_client(base_url):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+                                         NoRedirect)
+
+    def send(method, path, form=None, headers=None):
+        body = urllib.parse.urlencode(form).encode() if form is not None else None
+        request = urllib.request.Request(base_url + path, data=body, method=method, headers=headers or {})
+        try:
+            with opener.open(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    send('POST', '/login', {'username': USERNAME, 'password': PASSWORD})
+    return send
+
+
+def run_server(data, args, path):
+    # Pre-fork style: every worker process accepts on the same listening socket
+    listener = socket.socket()
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(('127.0.0.1', args.port))
+    listener.listen(128)
+    listener.set_inheritable(True)
+    servers = [subprocess.Popen([sys.executable, __file__, '--serve', str(listener.fileno())],
+                                pass_fds=(listener.fileno(),), stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL)
+               for _ in range(args.workers)]
+    base_url = f'http://127.0.0.1:{listener.getsockname()[1]}'
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(base_url + '/login').read()
+                break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.1)
+        clients = [http_client(base_url) for _ in range(args.clients)]
+        token = f'{time.time_ns():x}'
+        results = {}
+        for route in ROUTES:
+            count = max(args.clients, args.requests // 10 if route == 'login' else args.requests)
+            latencies, errors = [], [0]
+            lock = threading.Lock()
+
+            def worker(n, send, rng):
+                for i in range(n, count, args.clients):
+                    method, path_, form, headers = make_request(route, i, data, rng, token)
+                    begin = time.perf_counter()
+                    status = send(method, path_, form, headers)
+                    with lock:
+                        latencies.append(time.perf_counter() - begin)
+                        if status >= 400:
+                            errors[0] += 1
+
+            threads = [threading.Thread(target=worker, args=(n, send, random.Random(n)))
+                       for n, send in enumerate(clients)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            results[route] = summarize(latencies, time.perf_counter() - started, errors=errors[0])
+        return results
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+        listener.close()
+
+
+def serve(fd):
+    from werkzeug.serving import make_server
+    from app import app
+    install_template_stubs(app)
+    make_server('127.0.0.1', 0, app, threaded=True, fd=fd).serve_forever()
+
+
+def compare(results, baseline, threshold):
+    failures = []
+    for route, current in results.items():
+        if current['errors']:
+            failures.append(f"{route}: {current['errors']} failed requests")
+        base = baseline.get(route)
+        if base is None:
+            continue
+        if current['p95_ms'] > base['p95_ms'] * (1 + threshold):
+            failures.append(f"{route}: p95 {current['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+        if 'queries' in current and 'queries' in base and current['queries'] >= base['queries'] + QUERY_TOLERANCE:
+            failures.append(f"{route}: {current['queries']} queries/request vs baseline {base['queries']}")
+    return failures
+
+
+def print_results(label, results):
+    print(f'\n{label}')
+    print(f'{"route":<22}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"req/s":>9}{"queries":>9}{"errors":>8}')
+    for route, r in results.items():
+        print(f'{route:<22}{r["p50_ms"]:>9.2f}{r["p95_ms"]:>9.2f}{r["p99_ms"]:>9.2f}{r["rps"]:>9.1f}'
+              f'{r.get("queries", "-"):>9}{r["errors"]:>8}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, nargs='+', default=[1000])
+    parser.add_argument('--requests', type=int, default=200, help='Requests per route (login gets a tenth).')
+    parser.add_argument('--server', action='store_true', help='Drive a local multi-process server over HTTP.')
+    parser.add_argument('--workers', type=int, default=4, help='Server processes for --server.')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--port', type=int, default=0, help='Port for --server; any free port by default.')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed p95 growth, as a fraction.')
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--dataset', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        serve(args.serve)
+        return
+    if args.dataset is None:
+        # One process per dataset so every run starts from a fresh app and engine
+        failed = False
+        for students in args.students:
+            command = [sys.executable, __file__, '--dataset', str(students)] + sys.argv[1:]
+            failed |= subprocess.run(command).returncode != 0
+        sys.exit(1 if failed else 0)
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    data = seed_database(path, args.dataset)
+    mode = 'server' if args.server else 'test_client'
+    results = run_server(data, args, path) if args.server else run_test_client(data, args)
+    key = f'{mode}/{args.dataset}'
+    print_results(f'{key} students', results)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    if args.save_baseline:
+        baselines[key] = results
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'Saved baseline {key} to {args.baseline}')
+        return
+    if key not in baselines:
+        print(f'No baseline for {key}; run with --save-baseline to record one')
+        return
+    failures = compare(results, baselines[key], args.threshold)
+    for failure in failures:
+        print(f'REGRESSION {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
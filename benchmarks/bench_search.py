@@ -0,0 +1,58 @@
+"""Student search latency: FTS5 index versus the ilike fallback.
+
+Usage: python benchmarks/bench_search.py [--students 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from models import db
+import migrations
+import search
+import seed
+
+TERMS = ['rahul', 'rah', 'sharma', 'priya sharma', '+9198765', 'enr202612345']
+
+
+def measure(label, repeat):
+    print(f'\n== {label} ==')
+    for term in TERMS:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = search.search_students(term)
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        print(f'{term:16s} {elapsed:9.2f} ms  {len(results):3d} results')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    with app.app_context():
+        db.create_all()
+        seed.seed_courses()
+        seed.seed_students(args.students, seed=args.seed, as_of=date(2026, 9, 1))
+        start = time.perf_counter()
+        migrations.upgrade()
+        print(f'Seeded {args.students} students, indexed in {time.perf_counter() - start:.2f} s')
+
+        measure('fts5', args.repeat)
+        # Pin the probe result so the fallback is measured even though the index exists
+        search._fts_enabled[db.engine.url] = (False, None)
+        measure('ilike fallback', args.repeat)
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Cold start: import time and time to first request, each in a fresh interpreter.
+
+Usage: python benchmarks/bench_startup.py [--runs 10] [--max-import-ms N] [--max-first-request-ms N]
+
+Exits non-zero when a median exceeds its limit, or when importing the app
+pulls in a dependency that should only load on demand, so CI can track
+start-up regressions.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded by the first report or analytics request, never at start-up
+LAZY_MODULES = ('numpy', 'reportlab', 'openpyxl', 'pyarrow')
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from app import app
+imported = time.perf_counter()
+response = app.test_client().get('/')
+served = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_request_ms': (served - imported) * 1000,
+    'status': response.status_code,
+    'loaded': [name for name in %r if name in sys.modules],
+}))
+''' % (LAZY_MODULES,)
+
+
+def probe():
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-import-ms', type=float)
+    parser.add_argument('--max-first-request-ms', type=float)
+    args = parser.parse_args()
+
+    probe()  # warm the bytecode cache so the first run isn't an outlier
+    runs = [probe() for _ in range(args.runs)]
+    import_ms = statistics.median(run['import_ms'] for run in runs)
+    first_request_ms = statistics.median(run['first_request_ms'] for run in runs)
+    loaded = sorted({name for run in runs for name in run['loaded']})
+
+    print(f'import app:        {import_ms:8.1f} ms (median of {args.runs})')
+    print(f'first request:     {first_request_ms:8.1f} ms')
+    print(f'eager heavy deps:  {", ".join(loaded) or "none"}')
+
+    failed = bool(loaded)
+    if args.max_import_ms and import_ms > args.max_import_ms:
+        print(f'import time above {args.max_import_ms} ms')
+        failed = True
+    if args.max_first_request_ms and first_request_ms > args.max_first_request_ms:
+        print(f'first request above {args.max_first_request_ms} ms')
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
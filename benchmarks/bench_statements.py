@@ -0,0 +1,88 @@
+"""Fee statement rendering throughput in pages/sec.
+
+Usage: python benchmarks/bench_statements.py [--students 3000] [--single 200]
+
+Compares rebuilding styles and fonts for every statement (what the report
+code used to do) with the process-level cached styles, then renders a whole
+course as one PDF and as a zip with one and with several worker processes.
+"""
+import argparse
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from models import db, Course, Student
+from report_jobs import course_statements
+import report_rendering
+import seed
+
+PAGE = re.compile(rb'/Type /Page\b(?!s)')
+
+
+def pages(pdf):
+    return len(PAGE.findall(pdf))
+
+
+def report(label, page_count, elapsed):
+    print(f'{label:34s} {page_count:6d} pages in {elapsed:6.2f} s  {page_count / elapsed:8.1f} pages/s')
+
+
+def clear_caches():
+    for cached in (report_rendering.fonts, report_rendering.styles, report_rendering.grid_table_style,
+                   report_rendering.data_table_style, report_rendering.statement_table_style):
+        cached.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=3000)
+    parser.add_argument('--single', type=int, default=200, help='Statements rendered one by one.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(directory, 'bench.db')
+    with app.app_context():
+        db.create_all()
+        seed.seed_courses()
+        seed.seed_students(args.students, as_of=date(2026, 9, 1))
+        course_id = db.session.query(Student.course_id).group_by(Student.course_id).order_by(
+            db.func.count().desc()).first()[0]
+        statements = list(course_statements(course_id))
+        print(f'{len(statements)} students in course {db.session.get(Course, course_id).name}\n')
+
+    sample = statements[:args.single]
+
+    start = time.perf_counter()
+    page_count = 0
+    for statement in sample:
+        clear_caches()
+        page_count += pages(report_rendering.render_statement(statement))
+    report('single, styles rebuilt each time', page_count, time.perf_counter() - start)
+
+    report_rendering.render_statement(sample[0])
+    start = time.perf_counter()
+    page_count = sum(pages(report_rendering.render_statement(statement)) for statement in sample)
+    report('single, cached styles', page_count, time.perf_counter() - start)
+
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    report_rendering.render_statements_pdf(iter(statements), buffer)
+    report('course as one PDF', pages(buffer.getvalue()), time.perf_counter() - start)
+
+    for workers in sorted({1, args.workers}):
+        path = os.path.join(directory, f'statements_{workers}.zip')
+        start = time.perf_counter()
+        report_rendering.render_statements_zip(iter(statements), path, workers=workers)
+        report(f'course as zip, {workers} worker(s)', len(statements), time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Per-request latency and query count of authenticated routes, with and without the admin identity cache.
+
+Usage: python benchmarks/bench_user_loader.py [--requests 500] [--students 2000]
+
+Each route is requested through the Flask test client by a logged-in admin,
+once with the cache disabled (TTL 0, one user-loader SELECT per request) and
+once with it enabled.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+
+from app import app
+from extensions import admin_identities
+from models import db, Admin
+import seed
+
+ROUTES = [
+    '/dashboard/stats',
+    '/course_summary',
+    '/get_course_fees/1',
+    '/fee_dashboard/data',
+    '/payments/recent',
+]
+
+
+def run(client, route, requests, counter):
+    counter[0] = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(route)
+        assert response.status_code == 200, (route, response.status_code)
+    elapsed = time.perf_counter() - start
+    return elapsed / requests * 1000, counter[0] / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500, help='Requests per route and mode.')
+    parser.add_argument('--students', type=int, default=2000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    with app.app_context():
+        db.create_all()
+        db.session.add(Admin(username='bench', password_hash=generate_password_hash('bench')))
+        db.session.commit()
+        seed.seed_courses()
+        seed.seed_students(args.students, as_of=date(2026, 9, 1))
+        counter = [0]
+
+        def count(*_):
+            counter[0] += 1
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+
+    client = app.test_client()
+    client.post('/login', data={'username': 'bench', 'password': 'bench'})
+    cache = admin_identities
+
+    print(f'{"route":<22}{"uncached ms":>12}{"queries":>9}{"cached ms":>11}{"queries":>9}')
+    for route in ROUTES:
+        cache.ttl = 0
+        cache.invalidate()
+        uncached = run(client, route, args.requests, counter)
+        cache.ttl = 300
+        cached = run(client, route, args.requests, counter)
+        print(f'{route:<22}{uncached[0]:>12.3f}{uncached[1]:>9.1f}{cached[0]:>11.3f}{cached[1]:>9.1f}')
+    print(f'cache: {cache.metrics()}')
+
+
+if __name__ == '__main__':
+    main()
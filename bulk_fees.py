@@ -0,0 +1,277 @@
+"""Set-based fee operations: course fee revisions, discounts and payment batches.
+
+Each operation is one UPDATE (or one executemany) over every affected
+student in a single transaction, instead of loading and saving students one
+at a time. With dry_run=True nothing is written: the same expressions are
+run as a SELECT and the result carries the counts, the fee deltas and a
+preview of the first rows as they would be after the change.
+
+Revisions and discounts keep what a student has already paid; a student
+whose new total is below what they paid ends with nothing remaining and is
+counted as overpaid.
+"""
+import math
+import time
+from datetime import datetime
+
+from sqlalchemy import bindparam, case, func, update
+
+from models import db, Course, Payment, Student
+from money import literal_amount, rupees, scaled, to_paise, to_rupees
+import summary
+
+PREVIEW_ROWS = 20
+
+# Enrollment numbers are resolved in chunks to stay under bound-parameter limits
+LOOKUP_CHUNK = 500
+
+students = Student.__table__
+
+
+class BulkError(ValueError):
+    pass
+
+
+class BulkResult:
+    def __init__(self, operation, dry_run):
+        self.operation = operation
+        self.dry_run = dry_run
+        self.matched = 0
+        self.changed = 0
+        self.overpaid = 0
+        self.billed_delta = 0.0
+        self.paid_delta = 0.0
+        self.remaining_delta = 0.0
+        self.course_ids = set()
+        self.preview = []
+        self.errors = []
+        self.elapsed = 0.0
+
+    def add_error(self, line, message):
+        self.errors.append({'line': line, 'error': message})
+
+    def as_dict(self):
+        return {
+            'operation': self.operation,
+            'dry_run': self.dry_run,
+            'matched': self.matched,
+            'changed': self.changed,
+            'overpaid': self.overpaid,
+            'billed_delta': round(self.billed_delta, 2),
+            'paid_delta': round(self.paid_delta, 2),
+            'remaining_delta': round(self.remaining_delta, 2),
+            'course_ids': sorted(self.course_ids),
+            'preview': self.preview,
+            'failed': len(self.errors),
+            'errors': self.errors,
+            'elapsed': round(self.elapsed, 3),
+        }
+
+
+def _revise(result, criteria, new_total, dry_run):
+    """Set total_fees to new_total for students matching criteria, keeping paid_fees."""
+    paid = func.coalesce(Student.paid_fees, 0)
+    new_remaining = case((new_total > paid, new_total - paid), else_=0)
+
+    totals = db.session.query(
+        func.count(Student.id),
+        func.coalesce(func.sum(new_total - Student.total_fees), 0),
+        func.coalesce(func.sum(new_remaining - Student.remaining_fees), 0),
+        func.count(case((paid > new_total, 1))),
+    ).filter(*criteria).one()
+    result.matched, result.billed_delta, result.remaining_delta, result.overpaid = totals
+    result.course_ids = {course_id for (course_id,) in
+                         db.session.query(Student.course_id).filter(*criteria).distinct()}
+    result.preview = [
+        {'id': row.id, 'enrollment_number': row.enrollment_number, 'course_id': row.course_id,
+         'paid_fees': row.paid_fees, 'total_fees': row.total_fees, 'new_total_fees': row.new_total,
+         'remaining_fees': row.remaining_fees, 'new_remaining_fees': row.new_remaining}
+        for row in db.session.query(
+            Student.id, Student.enrollment_number, Student.course_id, paid.label('paid_fees'),
+            Student.total_fees, new_total.label('new_total'),
+            Student.remaining_fees, new_remaining.label('new_remaining'),
+        ).filter(*criteria).order_by(Student.id).limit(PREVIEW_ROWS)
+    ]
+    if dry_run:
+        return
+
+    # SET expressions see the row's old values, so remaining is computed from the old total
+    result.changed = db.session.execute(
+        update(Student)
+        .where(*criteria)
+        .values(total_fees=new_total, remaining_fees=new_remaining)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    summary.refresh(result.course_ids)
+
+
+def revise_course_fees(course_id, new_fee, dry_run=False):
+    """Change a course's fee and rescale every enrolled student's total to match.
+
+    Each student's total is scaled by new_fee / old fee, so any discount they
+    were admitted with still applies to the revised fee.
+    """
+    start = time.perf_counter()
+    result = BulkResult('revise_course_fees', dry_run)
+    course = Course.query.get(course_id)
+    if course is None:
+        raise BulkError(f'Unknown course {course_id}')
+    if not math.isfinite(new_fee) or new_fee < 0:
+        raise BulkError(f'Invalid fee {new_fee!r}, expected an amount of 0 or more')
+
+    new_fee = rupees(new_fee)
+    if course.total_fees:
+        new_total = scaled(Student.total_fees, new_fee / course.total_fees)
+    else:
+        new_total = literal_amount(new_fee)
+    try:
+        _revise(result, [Student.course_id == course_id], new_total, dry_run)
+        if not dry_run:
+            # Through the ORM, so cached course pages and the course API are invalidated
+            course.total_fees = new_fee
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def apply_discount(percent, course_id=None, pending_only=False, admitted_from=None, admitted_to=None,
+                   student_ids=None, dry_run=False):
+    """Reduce the current total of every matching student by percent."""
+    start = time.perf_counter()
+    result = BulkResult('apply_discount', dry_run)
+    if not 0 < percent <= 100:
+        raise BulkError('Discount must be greater than 0 and at most 100')
+
+    criteria = []
+    if course_id is not None:
+        criteria.append(Student.course_id == course_id)
+    if pending_only:
+        criteria.append(Student.remaining_fees > 0)
+    if admitted_from is not None:
+        criteria.append(Student.admission_date >= admitted_from)
+    if admitted_to is not None:
+        criteria.append(Student.admission_date <= admitted_to)
+    if student_ids is not None:
+        criteria.append(Student.id.in_(list(student_ids)))
+    if not criteria:
+        raise BulkError('Select the students to discount (course, dates, pending only or ids)')
+
+    new_total = scaled(Student.total_fees, 1 - percent / 100)
+    try:
+        _revise(result, criteria, new_total, dry_run)
+        if not dry_run:
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _parse_payment(row):
+    row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+    enrollment_number = row.get('enrollment_number')
+    if not enrollment_number:
+        raise BulkError('Missing enrollment_number')
+    try:
+        # rupees() rejects nan and inf with ValueError as well
+        amount = rupees(float(row.get('amount') or ''))
+    except ValueError:
+        raise BulkError(f'Invalid amount {row.get("amount")!r}')
+    if amount <= 0:
+        raise BulkError('Amount must be greater than 0')
+    paid_at = row.get('paid_at')
+    if paid_at:
+        try:
+            paid_at = datetime.fromisoformat(paid_at)
+        except ValueError:
+            raise BulkError(f'Invalid paid_at {paid_at!r}, expected YYYY-MM-DD[ HH:MM]')
+    return enrollment_number, amount, paid_at or None
+
+
+def post_payment_batch(rows, admin_id=None, dry_run=False):
+    """Post (line_number, row) payments from a bank statement in one transaction.
+
+    Rows need enrollment_number and amount and may carry paid_at. Invalid
+    rows, unknown students and students whose payments in the batch add up to
+    more than they owe are reported by line and skipped; the rest are posted
+    together. If a balance changed underneath the batch, nothing is posted.
+    """
+    start = time.perf_counter()
+    result = BulkResult('post_payment_batch', dry_run)
+    now = datetime.now()
+
+    parsed = []
+    for line, row in rows:
+        result.matched += 1
+        try:
+            parsed.append((line,) + _parse_payment(row))
+        except BulkError as e:
+            result.add_error(line, str(e))
+
+    numbers = list({number for _, number, _, _ in parsed})
+    balances = {}
+    for i in range(0, len(numbers), LOOKUP_CHUNK):
+        balances.update(
+            (row.enrollment_number, row) for row in db.session.query(
+                Student.id, Student.enrollment_number, Student.course_id, Student.remaining_fees,
+            ).filter(Student.enrollment_number.in_(numbers[i:i + LOOKUP_CHUNK]))
+        )
+
+    by_student = {}
+    for line, number, amount, paid_at in parsed:
+        student = balances.get(number)
+        if student is None:
+            result.add_error(line, f'Unknown enrollment number {number}')
+            continue
+        by_student.setdefault(student.id, (student, []))[1].append((line, amount, paid_at or now))
+
+    updates, payments, course_paid = [], [], {}
+    for student, lines in by_student.values():
+        total = to_rupees(sum(to_paise(amount) for _, amount, _ in lines))
+        if total > student.remaining_fees:
+            for line, _, _ in lines:
+                result.add_error(line, f'Payments for {student.enrollment_number} total ₹{total:.2f}, '
+                                       f'more than the ₹{student.remaining_fees:.2f} remaining')
+            continue
+        updates.append({'b_id': student.id, 'b_amount': total})
+        payments.extend({'student_id': student.id, 'amount': amount, 'paid_at': paid_at, 'admin_id': admin_id}
+                        for _, amount, paid_at in lines)
+        course_paid[student.course_id] = course_paid.get(student.course_id, 0) + to_paise(total)
+        if len(result.preview) < PREVIEW_ROWS:
+            result.preview.append({'id': student.id, 'enrollment_number': student.enrollment_number,
+                                   'payments': len(lines), 'amount': total,
+                                   'remaining_fees': student.remaining_fees,
+                                   'new_remaining_fees': rupees(student.remaining_fees - total)})
+
+    result.paid_delta = to_rupees(sum(course_paid.values()))
+    result.remaining_delta = -result.paid_delta
+    result.course_ids = set(course_paid)
+    if dry_run or not updates:
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    try:
+        # Same guard as a single payment: the balance check is part of the UPDATE
+        posted = db.session.execute(
+            students.update()
+            .where(students.c.id == bindparam('b_id'), students.c.remaining_fees >= bindparam('b_amount'))
+            .values(paid_fees=func.coalesce(students.c.paid_fees, 0) + bindparam('b_amount'),
+                    remaining_fees=students.c.remaining_fees - bindparam('b_amount')),
+            updates
+        ).rowcount
+        if posted != len(updates):
+            raise BulkError('Balances changed while the batch was being posted; nothing was recorded')
+        db.session.execute(Payment.__table__.insert(), payments)
+        for course_id, paise in course_paid.items():
+            summary.apply_delta(course_id, paid=to_rupees(paise), remaining=-to_rupees(paise))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    result.changed = len(updates)
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -0,0 +1,122 @@
+"""Command line tools: `flask db-upgrade`, `flask seed`, `flask import-students`, ...
+
+Schema changes and sample data live here rather than in application start-up,
+so a worker process only builds the app and starts serving.
+"""
+import os
+import time
+
+import click
+from flask import Blueprint, current_app
+
+from models import db
+from extensions import dashboard_stats, page_cache
+from importer import DEFAULT_BATCH_SIZE, import_students
+from routing import sync_sqlite_replica
+import export
+import migrations
+import seed
+import summary
+
+bp = Blueprint('commands', __name__, cli_group=None)
+
+
+@bp.cli.command('db-upgrade')
+def db_upgrade_command():
+    """Create missing tables and apply pending schema migrations."""
+    db.create_all()
+    applied = migrations.upgrade()
+    print(f"Applied migrations: {applied}" if applied else "Database is up to date")
+
+
+@bp.cli.command('import-students')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Rows inserted per transaction.')
+def import_students_command(path, batch_size):
+    """Bulk import students from a CSV or .xlsx file."""
+    if path.lower().endswith('.xlsx'):
+        f = open(path, 'rb')
+    else:
+        f = open(path, encoding='utf-8-sig', newline='')
+    with f:
+        result = import_students(f, filename=path, batch_size=batch_size)
+    dashboard_stats.invalidate()
+    page_cache.students_changed()
+    for error in result.errors:
+        print(f"Line {error['line']}: {error['error']}")
+    print(f"Imported {result.inserted} of {result.rows} rows in {result.elapsed:.2f}s "
+          f"({result.rows_per_second:,.0f} rows/s)")
+
+
+@bp.cli.command('seed')
+@click.option('--students', default=100, show_default=True, help='Number of students to generate.')
+@click.option('--seed', 'seed_value', default=42, show_default=True, help='Random seed.')
+@click.option('--as-of', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='Latest admission/payment date (defaults to today).')
+@click.option('--batch-size', default=seed.DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1))
+def seed_command(students, seed_value, as_of, batch_size):
+    """Create the sample admin and courses, then generate students."""
+    db.create_all()
+    migrations.upgrade()
+    seed.seed_admin()
+    seed.seed_courses()
+    elapsed = seed.seed_students(students, seed=seed_value, as_of=as_of and as_of.date(),
+                                 batch_size=batch_size,
+                                 progress=lambda done: print(f"{done}/{students} students", end='\r'))
+    dashboard_stats.invalidate()
+    page_cache.students_changed()
+    print(f"\nGenerated {students} students in {elapsed:.2f}s ({students / elapsed:,.0f} rows/s)")
+
+
+@bp.cli.command('rebuild-fee-summary')
+def rebuild_fee_summary_command():
+    """Recompute the per-course fee summary from the Student table."""
+    courses = summary.rebuild()
+    db.session.commit()
+    dashboard_stats.invalidate()
+    print(f"Rebuilt fee summary for {courses} courses")
+
+
+@bp.cli.command('check-fee-summary')
+def check_fee_summary_command():
+    """Compare the per-course fee summary with the Student table."""
+    mismatches = summary.check()
+    for course_id, column, stored, actual in mismatches:
+        print(f"Course {course_id}: {column} is {stored}, expected {actual}")
+    if mismatches:
+        raise SystemExit(1)
+    print("Fee summary is consistent")
+
+
+@bp.cli.command('export-fees')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--format', 'export_format', type=click.Choice(export.EXPORT_FORMATS),
+              help='Defaults to the extension of PATH.')
+@click.option('--course-id', type=int, help='Only students of this course.')
+@click.option('--pending-only', is_flag=True, help='Only students with fees remaining.')
+def export_fees_command(path, export_format, course_id, pending_only):
+    """Export student fee data to CSV, XLSX or Parquet."""
+    export_format = export_format or os.path.splitext(path)[1].lstrip('.').lower()
+    if export_format not in export.EXPORT_FORMATS:
+        raise click.BadParameter(f"Use one of {', '.join(export.EXPORT_FORMATS)}", param_hint='--format')
+    if export_format == 'csv':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            export.export_fees(f, 'csv', course_id=course_id, pending_only=pending_only)
+    else:
+        export.export_fees(path, export_format, course_id=course_id, pending_only=pending_only)
+    print(f"Exported fee data to {path}")
+
+@bp.cli.command('replica-sync')
+@click.option('--interval', type=float, help='Keep copying every INTERVAL seconds.')
+def replica_sync_command(interval):
+    """Refresh the SQLite read replica from the primary database."""
+    if 'replica' not in (current_app.config.get('SQLALCHEMY_BINDS') or {}):
+        raise click.ClickException('Set REPLICA_DATABASE_URL to enable the read replica')
+    while True:
+        started = time.perf_counter()
+        sync_sqlite_replica(db, current_app)
+        print(f"Replica refreshed in {time.perf_counter() - started:.2f}s")
+        if not interval:
+            break
+        time.sleep(interval)
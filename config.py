@@ -0,0 +1,85 @@
+"""Configuration profiles, selected with APP_PROFILE and overridden from the environment.
+
+    APP_PROFILE=production DATABASE_URL=postgresql://... flask run
+
+Every setting can also be set as an environment variable of the same name.
+"""
+import os
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def env_flag(name, default=False):
+    return os.environ.get(name, '1' if default else '0') == '1'
+
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///school.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+    REPLICA_LAG_SECONDS = env_int('REPLICA_LAG_SECONDS', 60)
+
+    # PRAGMAs run on every new SQLite connection; None leaves SQLite's default
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = env_int('SQLITE_BUSY_TIMEOUT', 5000)
+    SQLITE_CACHE_SIZE = env_int('SQLITE_CACHE_SIZE', -16384)
+    SQLITE_MMAP_SIZE = env_int('SQLITE_MMAP_SIZE', 0)
+
+    DB_POOL_SIZE = env_int('DB_POOL_SIZE', 5)
+    DB_MAX_OVERFLOW = env_int('DB_MAX_OVERFLOW', 10)
+    DB_POOL_TIMEOUT = env_int('DB_POOL_TIMEOUT', 30)
+    DB_POOL_RECYCLE = env_int('DB_POOL_RECYCLE', 1800)
+
+    DASHBOARD_STATS_TTL = env_int('DASHBOARD_STATS_TTL', 30)
+    SEARCH_RESULT_LIMIT = env_int('SEARCH_RESULT_LIMIT', 50)
+    REPORT_DIR = os.environ.get('REPORT_DIR')
+    REPORT_WORKERS = env_int('REPORT_WORKERS', 2)
+    ADMIN_CACHE_TTL = env_int('ADMIN_CACHE_TTL', 300)
+    COURSE_CACHE_TTL = env_int('COURSE_CACHE_TTL', 300)
+    PAGE_CACHE_ENABLED = env_flag('PAGE_CACHE_ENABLED', True)
+    PAGE_CACHE_BACKEND = os.environ.get('PAGE_CACHE_BACKEND', 'lru')
+    PAGE_CACHE_TTL = env_int('PAGE_CACHE_TTL', 300)
+    PAGE_CACHE_SIZE = env_int('PAGE_CACHE_SIZE', 2048)
+    PASSWORD_HASH_ALGORITHM = os.environ.get('PASSWORD_HASH_ALGORITHM', 'sha256')
+    PASSWORD_HASH_ITERATIONS = env_int('PASSWORD_HASH_ITERATIONS', 260000)
+    PASSWORD_HASH_WORKERS = env_int('PASSWORD_HASH_WORKERS', 2)
+    INSTRUMENTATION_ENABLED = env_flag('INSTRUMENTATION_ENABLED')
+    SLOW_QUERY_MS = env_int('SLOW_QUERY_MS', 100)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    PROFILE_ROUTES = [r for r in os.environ.get('PROFILE_ROUTES', '').split(',') if r]
+
+
+class DevelopmentConfig(Config):
+    pass
+
+
+class ProductionConfig(Config):
+    SQLITE_CACHE_SIZE = env_int('SQLITE_CACHE_SIZE', -65536)
+    SQLITE_MMAP_SIZE = env_int('SQLITE_MMAP_SIZE', 268435456)
+    DB_POOL_SIZE = env_int('DB_POOL_SIZE', 10)
+    DB_MAX_OVERFLOW = env_int('DB_MAX_OVERFLOW', 20)
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite://')
+    PASSWORD_HASH_ITERATIONS = env_int('PASSWORD_HASH_ITERATIONS', 1000)
+
+
+PROFILES = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
+}
+
+
+def load(app, profile=None):
+    profile = profile or os.environ.get('APP_PROFILE', 'development')
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown APP_PROFILE {profile!r}; expected one of {', '.join(PROFILES)}")
+    app.config.from_object(PROFILES[profile])
+    app.config['APP_PROFILE'] = profile
@@ -0,0 +1,69 @@
+"""Course metadata held in memory and dropped whenever a Course row changes.
+
+The add-student form asks for a course's fees on every selection change,
+and the API serves the catalogue to polling clients; neither should need a
+query for data that changes a few times a year. Mapper events reset the
+cache on insert, update or delete in this process, and the TTL bounds how
+long another worker can serve an old copy.
+"""
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from models import db, Course
+
+COURSE_FIELDS = ('id', 'name', 'duration', 'total_fees', 'description')
+
+
+class CourseCache:
+    def __init__(self, app=None, ttl=300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._expires_at = 0.0
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(Course, name, self._on_change)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('COURSE_CACHE_TTL', self.ttl)
+        app.extensions['course_cache'] = self
+
+    def snapshot(self):
+        """Return (courses by id, body bytes, etag, last_modified) for the whole catalogue."""
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() < self._expires_at:
+                self.hits += 1
+                return self._snapshot
+            self.misses += 1
+
+        rows = db.session.query(*(getattr(Course, field) for field in COURSE_FIELDS)).order_by(Course.id).all()
+        courses = {row.id: dict(zip(COURSE_FIELDS, row)) for row in rows}
+        body = json.dumps({'courses': list(courses.values())}, separators=(',', ':')).encode()
+        snapshot = (courses, body, hashlib.sha1(body).hexdigest(),
+                    datetime.now(timezone.utc).replace(microsecond=0))
+        with self._lock:
+            self._snapshot = snapshot
+            self._expires_at = time.monotonic() + self.ttl
+        return snapshot
+
+    def get(self, course_id):
+        return self.snapshot()[0].get(course_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def _on_change(self, mapper, connection, target):
+        self.invalidate()
+
+    def metrics(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'cached': self._snapshot is not None}
@@ -0,0 +1,66 @@
+"""Course pages and the per-course fee summary."""
+from flask import Blueprint, abort, flash, jsonify, redirect, render_template, request, url_for
+from flask_login import login_required
+
+from models import Course, CourseFeeSummary
+from extensions import course_cache, page_cache
+from listing import DEFAULT_PER_PAGE, course_students_page
+from routing import read_replica
+import summary
+
+bp = Blueprint('courses', __name__)
+
+
+@bp.route('/view_course_students/<int:course_id>')
+@login_required
+@read_replica
+@page_cache.cached(lambda course_id: [('course', course_id)])
+def view_course_students(course_id):
+    course = Course.query.get_or_404(course_id)
+    fee_summary = CourseFeeSummary.query.get(course_id)
+    try:
+        students, next_cursor = course_students_page(
+            course_id,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('per_page', DEFAULT_PER_PAGE, type=int))
+    except ValueError:
+        flash('Invalid page requested', 'danger')
+        return redirect(url_for('courses.view_course_students', course_id=course_id))
+    return render_template('course_students.html', course=course, students=students,
+                           next_cursor=next_cursor, fee_summary=fee_summary)
+
+@bp.route('/course_summary')
+@login_required
+@read_replica
+def course_summary_data():
+    return jsonify({'courses': [course._asdict() for course in summary.course_summaries()]})
+
+@bp.route('/view_course_students/<int:course_id>/data')
+@login_required
+@read_replica
+def course_students_data(course_id):
+    Course.query.get_or_404(course_id)
+    try:
+        students, next_cursor = course_students_page(
+            course_id,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('per_page', DEFAULT_PER_PAGE, type=int))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'students': [student._asdict() for student in students],
+        'next_cursor': next_cursor
+    })
+
+@bp.route('/get_course_fees/<int:course_id>')
+@login_required
+def get_course_fees(course_id):
+    course = course_cache.get(course_id)
+    if course is None:
+        abort(404)
+    response = jsonify({
+        'total_fees': course['total_fees'],
+        'duration': course['duration']
+    })
+    response.add_etag()
+    return response.make_conditional(request)
@@ -0,0 +1,43 @@
+"""The dashboard and the fee analytics behind it."""
+from flask import Blueprint, abort, jsonify, render_template
+from flask_login import login_required
+
+from extensions import dashboard_stats
+from routing import read_replica
+
+bp = Blueprint('dashboard', __name__)
+
+
+def fee_analytics():
+    # analytics pulls in numpy; load it on the first dashboard view, not at startup
+    from analytics import fee_analytics
+    return fee_analytics()
+
+
+@bp.route('/dashboard')
+@login_required
+@read_replica
+def dashboard():
+    # Dashboard statistics come from one cached aggregate query; chart data is memoized
+    return render_template('dashboard.html', analytics=fee_analytics(), **dashboard_stats.get())
+
+@bp.route('/dashboard/stats')
+@login_required
+@read_replica
+def dashboard_stats_json():
+    return jsonify({
+        'stats': dashboard_stats.get(),
+        'cache': dashboard_stats.metrics()
+    })
+
+@bp.route('/analytics')
+@bp.route('/analytics/<section>')
+@login_required
+@read_replica
+def analytics_data(section=None):
+    analytics = fee_analytics()
+    if section is None:
+        return jsonify(analytics)
+    if section not in analytics:
+        abort(404)
+    return jsonify({section: analytics[section]})
@@ -0,0 +1,85 @@
+"""Enrollment number allocation from a per-year counter row.
+
+Reserving numbers is one UPDATE of the counter row plus a read of the new
+value in the same short transaction, so concurrent admissions never see the
+same number and bulk imports can reserve a whole block at once. Numbers
+reserved by a request that later fails are not reused, like a sequence.
+"""
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from models import db, EnrollmentCounter, Student
+
+PREFIX = 'ENR'
+
+counters = EnrollmentCounter.__table__
+
+
+def format_enrollment_number(year, number):
+    # Four digits as before; numbers past 9999 widen instead of wrapping
+    return f"{PREFIX}{year}{number:04d}"
+
+
+def _highest_existing_number(connection, year):
+    prefix = f"{PREFIX}{year}"
+    enrollment_number = connection.execute(
+        select(Student.enrollment_number)
+        .where(Student.enrollment_number.like(f"{prefix}%"))
+        .order_by(func.length(Student.enrollment_number).desc(), Student.enrollment_number.desc())
+        .limit(1)
+    ).scalar()
+    suffix = enrollment_number[len(prefix):] if enrollment_number else ''
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def _ensure_counter(engine, year):
+    try:
+        with engine.begin() as connection:
+            exists = connection.execute(
+                select(counters.c.year).where(counters.c.year == year)
+            ).first()
+            if exists is None:
+                connection.execute(counters.insert().values(
+                    year=year, last_number=_highest_existing_number(connection, year)
+                ))
+    except IntegrityError:
+        # Another worker created this year's counter first
+        pass
+
+
+def _bump(engine, year, count):
+    with engine.begin() as connection:
+        updated = connection.execute(
+            counters.update()
+            .where(counters.c.year == year)
+            .values(last_number=counters.c.last_number + count)
+        ).rowcount
+        if not updated:
+            return None
+        return connection.execute(
+            select(counters.c.last_number).where(counters.c.year == year)
+        ).scalar()
+
+
+def reserve_numbers(count=1, year=None):
+    """Atomically reserve count consecutive numbers and return them as a range."""
+    if count < 1:
+        raise ValueError('count must be at least 1')
+    year = year or datetime.now().year
+    engine = db.engine
+    last = _bump(engine, year, count)
+    if last is None:
+        _ensure_counter(engine, year)
+        last = _bump(engine, year, count)
+    return range(last - count + 1, last + 1)
+
+
+def allocate_enrollment_numbers(count=1, year=None):
+    year = year or datetime.now().year
+    return [format_enrollment_number(year, number) for number in reserve_numbers(count, year)]
+
+
+def generate_enrollment_number():
+    return allocate_enrollment_numbers(1)[0]
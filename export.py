@@ -0,0 +1,127 @@
+"""Streaming fee data exports in CSV, XLSX and Parquet.
+
+Rows come from one Student+Course query read with yield_per (server-side
+cursors where the driver supports them), so memory stays constant however
+many students are exported. CSV is produced as a generator for a streamed
+response; XLSX (openpyxl, write-only) and Parquet (pyarrow) are optional and
+written chunk by chunk to a file.
+"""
+import csv
+import io
+from itertools import islice
+
+from models import db, Course, Student
+
+EXPORT_FORMATS = ('csv', 'xlsx', 'parquet')
+MIMETYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet',
+}
+CHUNK_SIZE = 5000
+
+COLUMNS = (
+    Student.enrollment_number,
+    Student.first_name,
+    Student.last_name,
+    Course.name.label('course'),
+    Student.admission_date,
+    Student.phone,
+    Student.email,
+    Student.total_fees,
+    Student.paid_fees,
+    Student.remaining_fees,
+)
+HEADER = [column.key for column in COLUMNS]
+
+
+def fee_rows(course_id=None, pending_only=False, chunk_size=CHUNK_SIZE):
+    query = db.session.query(*COLUMNS).join(Course, Student.course_id == Course.id)
+    if course_id:
+        query = query.filter(Student.course_id == course_id)
+    if pending_only:
+        query = query.filter(Student.remaining_fees > 0)
+    return query.order_by(Student.id).execution_options(stream_results=True).yield_per(chunk_size)
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_csv(rows, chunk_size=1000):
+    """Yield the CSV export as text chunks of chunk_size rows each."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADER)
+    for chunk in _chunks(rows, chunk_size):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def write_csv(rows, target):
+    for text in iter_csv(rows):
+        target.write(text)
+
+
+def write_xlsx(rows, target):
+    try:
+        from openpyxl import Workbook
+    except ImportError as e:
+        raise RuntimeError('XLSX export requires openpyxl (pip install openpyxl)') from e
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Fees')
+    sheet.append(HEADER)
+    for row in rows:
+        sheet.append(list(row))
+    workbook.save(target)
+
+
+def write_parquet(rows, target, chunk_size=CHUNK_SIZE):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError('Parquet export requires pyarrow (pip install pyarrow)') from e
+    schema = pa.schema([
+        ('enrollment_number', pa.string()),
+        ('first_name', pa.string()),
+        ('last_name', pa.string()),
+        ('course', pa.string()),
+        ('admission_date', pa.date32()),
+        ('phone', pa.string()),
+        ('email', pa.string()),
+        ('total_fees', pa.float64()),
+        ('paid_fees', pa.float64()),
+        ('remaining_fees', pa.float64()),
+    ])
+    # One row group per chunk keeps only chunk_size rows in memory
+    with pq.ParquetWriter(target, schema) as writer:
+        for chunk in _chunks(rows, chunk_size):
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+
+
+WRITERS = {
+    'csv': write_csv,
+    'xlsx': write_xlsx,
+    'parquet': write_parquet,
+}
+
+
+def export_fees(target, format='csv', course_id=None, pending_only=False):
+    """Write the fee export to target (a path, or a file object opened to suit the format)."""
+    if format not in WRITERS:
+        raise ValueError(f"Unknown export format {format!r}")
+    WRITERS[format](fee_rows(course_id=course_id, pending_only=pending_only), target)
@@ -0,0 +1,30 @@
+"""Extension and cache instances shared by the blueprints.
+
+They are created unbound so views can import them at module level, and are
+bound to an application by create_app() in app.py.
+"""
+from flask_login import LoginManager
+
+from course_cache import CourseCache
+from identity import IdentityCache
+from instrumentation import Instrumentation
+from page_cache import PageCache
+from passwords import PasswordHasher
+from report_jobs import ReportJobs
+from stats import DashboardStats
+
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
+
+dashboard_stats = DashboardStats()
+report_jobs = ReportJobs()
+instrumentation = Instrumentation()
+admin_identities = IdentityCache()
+password_hasher = PasswordHasher()
+course_cache = CourseCache()
+page_cache = PageCache()
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    return admin_identities.load(user_id)
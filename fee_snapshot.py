@@ -0,0 +1,126 @@
+"""Compact in-memory snapshot of every student's fees.
+
+Parallel array('q') columns, in student id order, hold each student's
+course, admission day and fee amounts in integer paise: eight bytes per
+value rather than an ORM object per student. numpy() returns views over
+the same buffers without copying, so analytics aggregate the whole student
+body exactly in a few array operations, and row() finds one student by
+binary search on the id column.
+
+The snapshot is rebuilt from one query whenever data_version() changes.
+"""
+import threading
+from array import array
+from bisect import bisect_left
+
+from sqlalchemy import func, literal_column, select
+
+from models import db, Course, CourseFeeSummary, Student
+from money import to_rupees
+
+COLUMNS = ('student_id', 'course_id', 'admitted', 'list_fee', 'total', 'paid', 'remaining')
+AMOUNTS = ('list_fee', 'total', 'paid', 'remaining')
+
+_current = {'version': None, 'snapshot': None}
+_lock = threading.Lock()
+
+
+def data_version():
+    """A fingerprint that changes whenever any fee total, course fee, student or admission date changes.
+
+    Two aggregate queries, far cheaper than reloading the snapshot.
+    """
+    rows = db.session.query(
+        Course.id, Course.total_fees, CourseFeeSummary.student_count,
+        CourseFeeSummary.total_billed, CourseFeeSummary.total_paid
+    ).outerjoin(CourseFeeSummary, CourseFeeSummary.course_id == Course.id).order_by(Course.id).all()
+    # The per-course totals cannot tell one student replaced by another with the
+    # same fees, or a changed admission date
+    if db.session.get_bind().dialect.name == 'sqlite':
+        admitted = func.julianday(Student.admission_date)
+    else:
+        admitted = Student.admission_date - literal_column("DATE '1970-01-01'")
+    students = db.session.query(func.max(Student.id), func.sum(Student.id), func.sum(admitted)).one()
+    return tuple(tuple(row) for row in rows) + (tuple(students),)
+
+
+class FeeSnapshot:
+    def __init__(self, columns):
+        self.columns = columns
+
+    @classmethod
+    def load(cls):
+        import numpy as np
+
+        statement = select(
+            Student.id,
+            Student.course_id,
+            Student.admission_date,
+            Course.total_fees,
+            Student.total_fees,
+            func.coalesce(Student.paid_fees, literal_column('0')),
+            Student.remaining_fees,
+        ).join(Course, Student.course_id == Course.id).order_by(Student.id)
+        # Plain DB-API tuples: amounts arrive as stored, in paise, and no Row
+        # objects or per-row date parsing are needed
+        connection = db.session.connection()
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(str(statement.compile(dialect=connection.dialect)))
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        values = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+
+        columns = {}
+        for name, column in zip(COLUMNS, values):
+            if name == 'admitted':
+                # Days since 1970-01-01; NumPy parses the dates in bulk
+                days = np.array(column, dtype='datetime64[D]').astype(np.int64)
+                columns[name] = array('q', days.tobytes())
+            else:
+                columns[name] = array('q', column)
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns['student_id'])
+
+    @property
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    def numpy(self):
+        """Zero-copy int64 views of every column; admitted is datetime64[D]."""
+        import numpy as np
+
+        views = {name: np.frombuffer(column, dtype=np.int64) if len(column) else np.zeros(0, dtype=np.int64)
+                 for name, column in self.columns.items()}
+        views['admitted'] = views['admitted'].view('datetime64[D]')
+        return views
+
+    def row(self, student_id):
+        """One student's fees in rupees, or None if they are not in the snapshot."""
+        ids = self.columns['student_id']
+        i = bisect_left(ids, student_id)
+        if i == len(ids) or ids[i] != student_id:
+            return None
+        row = {'student_id': student_id, 'course_id': self.columns['course_id'][i]}
+        row.update((name, to_rupees(self.columns[name][i])) for name in AMOUNTS)
+        return row
+
+    def totals(self):
+        """Exact sums over every student, in rupees."""
+        views = self.numpy()
+        return {name: to_rupees(views[name].sum()) for name in AMOUNTS}
+
+
+def current():
+    """The snapshot for the current data version, rebuilt only when fees change."""
+    version = data_version()
+    with _lock:
+        if _current['version'] == version:
+            return _current['snapshot']
+    snapshot = FeeSnapshot.load()
+    with _lock:
+        _current['version'], _current['snapshot'] = version, snapshot
+    return snapshot
@@ -0,0 +1,192 @@
+"""Fee payments, the fee dashboard and fee exports."""
+import csv
+import tempfile
+from datetime import datetime
+
+from flask import (Blueprint, Response, abort, flash, jsonify, redirect, render_template, request, send_file,
+                   stream_with_context, url_for)
+from flask_login import current_user, login_required
+
+from models import db, Student
+from extensions import dashboard_stats, page_cache
+from bulk_fees import BulkError, apply_discount, post_payment_batch, revise_course_fees
+from importer import read_rows
+from listing import DEFAULT_PER_PAGE, pending_fees_page
+from payments import PaymentError, post_payment, recent_payments
+from routing import read_replica
+import export
+import money
+
+bp = Blueprint('fees', __name__)
+
+
+@bp.route('/pay_fees/<int:student_id>', methods=['GET', 'POST'])
+@login_required
+def pay_fees(student_id):
+    student = Student.query.get_or_404(student_id)
+    
+    if request.method == 'POST':
+        try:
+            amount = money.rupees(float(request.form.get('amount', 0)))
+            
+            # Read before the commit expires the student, which would cost a reload
+            course_id = student.course_id
+            # Balance check and update happen in one conditional UPDATE
+            post_payment(student_id, amount, admin_id=current_user.id)
+            dashboard_stats.adjust(collected=amount, pending=-amount)
+            page_cache.student_changed(student_id, course_id)
+            flash(f'Payment of ₹{amount:.2f} recorded successfully!', 'success')
+            return redirect(url_for('students.student_details', student_id=student_id))
+            
+        except PaymentError as e:
+            if amount > 0:
+                flash(f'{e} (₹{student.remaining_fees:.2f})', 'danger')
+            else:
+                flash(str(e), 'danger')
+            return redirect(url_for('fees.pay_fees', student_id=student.id))
+        except ValueError:
+            flash('Please enter a valid amount', 'danger')
+            return redirect(url_for('fees.pay_fees', student_id=student.id))
+    
+    return render_template('pay_fees.html', student=student)
+
+@bp.route('/fee_dashboard')
+@login_required
+@read_replica
+def fee_dashboard():
+    # Get students with pending fees, ordered by highest remaining amount, one page at a time
+    try:
+        students_with_pending_fees, next_cursor = pending_fees_page(
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('per_page', DEFAULT_PER_PAGE, type=int))
+    except ValueError:
+        flash('Invalid page requested', 'danger')
+        return redirect(url_for('fees.fee_dashboard'))
+    
+    # Get recent fee payments from the ledger
+    payments, _ = recent_payments(limit=10)
+    
+    return render_template('fee_dashboard.html', 
+                          students=students_with_pending_fees,
+                          next_cursor=next_cursor,
+                          recent_payments=payments,
+                          total_pending=dashboard_stats.get()['total_fees_pending'])
+
+@bp.route('/fee_dashboard/data')
+@login_required
+@read_replica
+def fee_dashboard_data():
+    try:
+        students, next_cursor = pending_fees_page(
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('per_page', DEFAULT_PER_PAGE, type=int))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'students': [student._asdict() for student in students],
+        'next_cursor': next_cursor
+    })
+
+@bp.route('/payments/recent')
+@login_required
+@read_replica
+def recent_payments_data():
+    try:
+        payments, next_cursor = recent_payments(
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('per_page', 20, type=int))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'payments': [dict(payment._asdict(), paid_at=payment.paid_at.isoformat())
+                     for payment in payments],
+        'next_cursor': next_cursor
+    })
+
+@bp.route('/export/fees.<export_format>')
+@login_required
+@read_replica
+def export_fees(export_format):
+    if export_format not in export.EXPORT_FORMATS:
+        abort(404)
+    course_id = request.args.get('course_id', type=int)
+    pending_only = request.args.get('pending_only') == '1'
+    filename = f"fees_{datetime.now():%Y%m%d_%H%M%S}.{export_format}"
+    headers = {'Content-Disposition': f'attachment; filename={filename}'}
+
+    if export_format == 'csv':
+        # Streamed straight from the cursor, so the download starts immediately
+        rows = export.fee_rows(course_id=course_id, pending_only=pending_only)
+        return Response(stream_with_context(export.iter_csv(rows)),
+                        mimetype=export.MIMETYPES['csv'], headers=headers)
+
+    # XLSX and Parquet need a complete file; spool it to disk rather than memory
+    target = tempfile.TemporaryFile()
+    try:
+        export.export_fees(target, export_format, course_id=course_id, pending_only=pending_only)
+    except RuntimeError as e:
+        target.close()
+        return jsonify({'error': str(e)}), 501
+    target.seek(0)
+    return send_file(target, mimetype=export.MIMETYPES[export_format], as_attachment=True,
+                     download_name=filename)
+
+
+
+def _bulk_response(operation):
+    """Run a bulk fee operation for a route and return its result as JSON."""
+    try:
+        result = operation()
+    except BulkError as e:
+        return jsonify({'error': str(e)}), 400
+    except (ValueError, RuntimeError, csv.Error) as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    if result.changed:
+        dashboard_stats.invalidate()
+        page_cache.students_changed(result.course_ids)
+    return jsonify(result.as_dict())
+
+def _form_date(name):
+    value = request.form.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise BulkError(f'Invalid {name} {value!r}, expected YYYY-MM-DD')
+
+@bp.route('/fees/revise_course/<int:course_id>', methods=['POST'])
+@login_required
+def revise_course(course_id):
+    new_fee = request.form.get('total_fees', type=float)
+    if new_fee is None:
+        return jsonify({'error': 'Please enter the revised course fee'}), 400
+    return _bulk_response(lambda: revise_course_fees(course_id, new_fee,
+                                                     dry_run=request.form.get('dry_run') == '1'))
+
+@bp.route('/fees/discount', methods=['POST'])
+@login_required
+def bulk_discount():
+    percent = request.form.get('percent', type=float)
+    if percent is None:
+        return jsonify({'error': 'Please enter a discount percentage'}), 400
+    student_ids = request.form.getlist('student_id', type=int) or None
+    return _bulk_response(lambda: apply_discount(
+        percent,
+        course_id=request.form.get('course_id', type=int),
+        pending_only=request.form.get('pending_only') == '1',
+        admitted_from=_form_date('admitted_from'),
+        admitted_to=_form_date('admitted_to'),
+        student_ids=student_ids,
+        dry_run=request.form.get('dry_run') == '1'))
+
+@bp.route('/fees/reconcile', methods=['POST'])
+@login_required
+def reconcile_payments():
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'error': 'Please upload a CSV or .xlsx bank statement'}), 400
+    return _bulk_response(lambda: post_payment_batch(read_rows(upload.stream, upload.filename),
+                                                     admin_id=current_user.id,
+                                                     dry_run=request.form.get('dry_run') == '1'))
@@ -0,0 +1,73 @@
+"""In-process cache of logged-in admin identities for Flask-Login.
+
+Flask-Login calls the user loader on every authenticated request. Caching a
+small, read-only identity (id and username, never the password hash) saves
+that SELECT on every page view. Entries expire after the TTL, so a change
+made by another worker is picked up within that window; changes made here
+invalidate the cache directly.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask_login import UserMixin
+
+from models import db, Admin
+
+
+class AdminIdentity(UserMixin):
+    __slots__ = ('id', 'username')
+
+    def __init__(self, id, username):
+        self.id = id
+        self.username = username
+
+    def __repr__(self):
+        return f'<AdminIdentity {self.id} {self.username}>'
+
+
+class IdentityCache:
+    def __init__(self, ttl=300, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('ADMIN_CACHE_TTL', self.ttl)
+
+    def load(self, user_id):
+        user_id = int(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now < entry[1]:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        row = db.session.query(Admin.id, Admin.username).filter(Admin.id == user_id).first()
+        if row is None:
+            return None
+        identity = AdminIdentity(row.id, row.username)
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[user_id] = (identity, now + self.ttl)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return identity
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(user_id), None)
+
+    def metrics(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
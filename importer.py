@@ -0,0 +1,212 @@
+"""Streaming bulk import of students from CSV or Excel files.
+
+Rows are validated against a course map and the sets of enrollment numbers
+and emails already in the database, then inserted with executemany in
+batches, one transaction per batch. Invalid rows are reported by line number
+and skipped; the rest of the file is still imported.
+"""
+import csv
+import io
+import time
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Course, Student
+from enrollment import allocate_enrollment_numbers
+import money
+import summary
+
+DEFAULT_BATCH_SIZE = 1000
+
+REQUIRED_FIELDS = (
+    'first_name', 'last_name', 'date_of_birth', 'gender', 'father_name',
+    'mother_name', 'address', 'phone', 'email',
+)
+
+
+class RowError(ValueError):
+    pass
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def add_error(self, line, message):
+        self.errors.append({'line': line, 'error': message})
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'inserted': self.inserted,
+            'failed': len(self.errors),
+            'errors': self.errors,
+            'elapsed': round(self.elapsed, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+
+def read_csv(stream):
+    """Yield (line_number, row dict) from a text stream."""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_xlsx(stream):
+    """Yield (line_number, row dict) from an .xlsx file; requires openpyxl."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise RuntimeError('Excel import requires openpyxl (pip install openpyxl)') from e
+    sheet = load_workbook(stream, read_only=True, data_only=True).active
+    rows = sheet.iter_rows(values_only=True)
+    header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+    for line, values in enumerate(rows, start=2):
+        yield line, {key: ('' if value is None else str(value)) for key, value in zip(header, values)}
+
+
+def read_rows(stream, filename):
+    if filename.lower().endswith('.xlsx'):
+        return read_xlsx(stream)
+    if isinstance(stream, io.TextIOBase):
+        return read_csv(stream)
+    return read_csv(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+
+
+class StudentImporter:
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        courses = db.session.query(Course.id, Course.name, Course.total_fees).all()
+        self.course_fees = {course.id: course.total_fees for course in courses}
+        self.course_names = {course.name.strip().lower(): course.id for course in courses}
+        self.enrollment_numbers = {
+            number for (number,) in db.session.query(Student.enrollment_number)
+        }
+        self.emails = {email.lower() for (email,) in db.session.query(Student.email)}
+
+    def _course_id(self, row):
+        value = (row.get('course_id') or '').strip()
+        if value:
+            try:
+                course_id = int(float(value))
+            except ValueError:
+                raise RowError(f'Invalid course_id {value!r}')
+        else:
+            name = (row.get('course') or '').strip().lower()
+            if not name:
+                raise RowError('Missing course_id or course')
+            course_id = self.course_names.get(name)
+        if course_id not in self.course_fees:
+            raise RowError(f'Unknown course {value or row.get("course")!r}')
+        return course_id
+
+    def validate(self, row, admission_date):
+        """Return a Student mapping for row, or raise RowError."""
+        row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+        if missing:
+            raise RowError(f'Missing {", ".join(missing)}')
+
+        try:
+            date_of_birth = datetime.strptime(row['date_of_birth'][:10], '%Y-%m-%d').date()
+        except ValueError:
+            raise RowError(f'Invalid date_of_birth {row["date_of_birth"]!r}, expected YYYY-MM-DD')
+
+        course_id = self._course_id(row)
+        try:
+            discount = float(row.get('discount') or 0)
+        except ValueError:
+            raise RowError(f'Invalid discount {row["discount"]!r}')
+        if not 0 <= discount <= 100:
+            raise RowError('Discount must be between 0 and 100')
+
+        enrollment_number = row.get('enrollment_number') or None
+        if enrollment_number and enrollment_number in self.enrollment_numbers:
+            raise RowError(f'Enrollment number {enrollment_number} already exists')
+        email = row['email']
+        if email.lower() in self.emails:
+            raise RowError(f'Email {email} already exists')
+
+        total_fees = money.discounted(self.course_fees[course_id], discount)
+        if enrollment_number:
+            self.enrollment_numbers.add(enrollment_number)
+        self.emails.add(email.lower())
+        return {
+            'enrollment_number': enrollment_number,
+            'first_name': row['first_name'],
+            'last_name': row['last_name'],
+            'date_of_birth': date_of_birth,
+            'gender': row['gender'],
+            'father_name': row['father_name'],
+            'mother_name': row['mother_name'],
+            'address': row['address'],
+            'phone': row['phone'],
+            'email': email,
+            'admission_date': admission_date,
+            'course_id': course_id,
+            'total_fees': total_fees,
+            'paid_fees': 0.0,
+            'remaining_fees': total_fees,
+        }
+
+    def _insert(self, batch, result):
+        unnumbered = [mapping for _, mapping in batch if not mapping['enrollment_number']]
+        if unnumbered:
+            for mapping, number in zip(unnumbered, allocate_enrollment_numbers(len(unnumbered))):
+                mapping['enrollment_number'] = number
+                self.enrollment_numbers.add(number)
+        try:
+            mappings = [mapping for _, mapping in batch]
+            db.session.bulk_insert_mappings(Student, mappings)
+            summary.apply_students(mappings)
+            db.session.commit()
+            result.inserted += len(batch)
+        except IntegrityError:
+            # Something slipped past validation (e.g. a concurrent admission);
+            # retry the batch row by row to pin down the offending lines
+            db.session.rollback()
+            for line, mapping in batch:
+                try:
+                    db.session.bulk_insert_mappings(Student, [mapping])
+                    summary.apply_students([mapping])
+                    db.session.commit()
+                    result.inserted += 1
+                except IntegrityError as e:
+                    db.session.rollback()
+                    result.add_error(line, str(e.orig))
+
+    def run(self, rows):
+        """Import (line_number, row) pairs and return an ImportResult."""
+        result = ImportResult()
+        admission_date = datetime.now().date()
+        start = time.perf_counter()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                break
+            batch = []
+            for line, row in chunk:
+                result.rows += 1
+                try:
+                    batch.append((line, self.validate(row, admission_date)))
+                except RowError as e:
+                    result.add_error(line, str(e))
+            if batch:
+                self._insert(batch, result)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+def import_students(stream, filename='students.csv', batch_size=DEFAULT_BATCH_SIZE):
+    return StudentImporter(batch_size=batch_size).run(read_rows(stream, filename))
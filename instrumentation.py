@@ -0,0 +1,223 @@
+"""Opt-in request and SQL instrumentation.
+
+When INSTRUMENTATION_ENABLED is set, every request is timed, every SQL
+statement is counted and timed against the request that issued it, repeated
+statements are flagged as likely N+1 patterns and slow statements are
+logged. Totals are served in the Prometheus text format at /metrics to a
+logged-in admin or a scraper sending METRICS_TOKEN as a bearer token, and
+each response gets a Server-Timing header. Routes listed in PROFILE_ROUTES
+are also run under cProfile (or pyinstrument, if chosen and installed) with
+a dump written to PROFILE_DIR.
+"""
+import cProfile
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import Response, abort, g, has_request_context, request
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('school.instrumentation')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Metrics:
+    """A minimal thread-safe registry rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter()
+        self.request_seconds = defaultdict(float)
+        self.request_buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+        self.queries = Counter()
+        self.query_seconds = defaultdict(float)
+        self.n_plus_one = Counter()
+        self.slow_queries = Counter()
+
+    def observe_request(self, endpoint, method, status, seconds, queries, query_seconds):
+        with self._lock:
+            key = (endpoint, method, str(status))
+            self.requests[key] += 1
+            self.request_seconds[key] += seconds
+            buckets = self.request_buckets[key]
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            self.queries[endpoint] += queries
+            self.query_seconds[endpoint] += query_seconds
+
+    def observe_n_plus_one(self, endpoint):
+        with self._lock:
+            self.n_plus_one[endpoint] += 1
+
+    def observe_slow_query(self, endpoint):
+        with self._lock:
+            self.slow_queries[endpoint] += 1
+
+    def render(self):
+        lines = []
+
+        def sample(name, labels, value):
+            label_text = ','.join(f'{key}="{value}"' for key, value in labels)
+            lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                sample(name, labels, value)
+
+        with self._lock:
+            family('http_requests_total', 'counter', 'Requests handled.',
+                   [((('endpoint', e), ('method', m), ('status', s)), n) for (e, m, s), n in sorted(self.requests.items())])
+            name = 'http_request_duration_seconds'
+            lines.append(f'# HELP {name} Request duration.')
+            lines.append(f'# TYPE {name} histogram')
+            for key, buckets in sorted(self.request_buckets.items()):
+                labels = tuple(zip(('endpoint', 'method', 'status'), key))
+                # Bucket counts are already cumulative: each request counts in every bucket it fits
+                for bound, count in zip(DURATION_BUCKETS, buckets):
+                    sample(f'{name}_bucket', labels + (('le', bound),), count)
+                sample(f'{name}_bucket', labels + (('le', '+Inf'),), self.requests[key])
+                sample(f'{name}_sum', labels, round(self.request_seconds[key], 6))
+                sample(f'{name}_count', labels, self.requests[key])
+            family('db_queries_total', 'counter', 'SQL statements executed.',
+                   [((('endpoint', e),), n) for e, n in sorted(self.queries.items())])
+            family('db_query_duration_seconds_sum', 'counter', 'Total SQL time.',
+                   [((('endpoint', e),), round(v, 6)) for e, v in sorted(self.query_seconds.items())])
+            family('db_n_plus_one_total', 'counter', 'Requests that repeated one statement N+1 style.',
+                   [((('endpoint', e),), n) for e, n in sorted(self.n_plus_one.items())])
+            family('db_slow_queries_total', 'counter', 'Statements slower than SLOW_QUERY_MS.',
+                   [((('endpoint', e),), n) for e, n in sorted(self.slow_queries.items())])
+        return '\n'.join(lines) + '\n'
+
+
+class Instrumentation:
+    def __init__(self, app=None):
+        self.metrics = Metrics()
+        self.enabled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get('INSTRUMENTATION_ENABLED'))
+        if not self.enabled:
+            return
+        self.slow_query_seconds = app.config.get('SLOW_QUERY_MS', 100) / 1000
+        self.n_plus_one_threshold = app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+        self.profile_routes = set(app.config.get('PROFILE_ROUTES') or ())
+        self.profile_dir = app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+        self.profiler = app.config.get('PROFILER', 'cprofile')
+        self.metrics_token = app.config.get('METRICS_TOKEN')
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        if not event.contains(Engine, 'before_cursor_execute', self._before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def metrics_view(self):
+        if not current_user.is_authenticated:
+            supplied = request.headers.get('Authorization', '').partition('Bearer ')[2]
+            if not (self.metrics_token and hmac.compare_digest(supplied, self.metrics_token)):
+                abort(401)
+        return Response(self.metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    def _before_request(self):
+        g.instrumentation = {
+            'start': time.perf_counter(),
+            'queries': 0,
+            'query_seconds': 0.0,
+            'statements': Counter(),
+        }
+        endpoint = request.endpoint or ''
+        # Blueprint endpoints can be listed with or without their prefix
+        if {'*', endpoint, endpoint.rpartition('.')[2]} & self.profile_routes:
+            g.instrumentation['profiler'] = self._start_profiler()
+
+    def _after_request(self, response):
+        state = g.pop('instrumentation', None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state['start']
+        endpoint = request.endpoint or 'unknown'
+        self.metrics.observe_request(endpoint, request.method, response.status_code, elapsed,
+                                     state['queries'], state['query_seconds'])
+
+        repeated = [(statement, n) for statement, n in state['statements'].items()
+                    if n >= self.n_plus_one_threshold]
+        if repeated:
+            self.metrics.observe_n_plus_one(endpoint)
+            for statement, n in repeated:
+                logger.warning('Possible N+1 in %s: %d executions of %s', endpoint, n, statement[:200])
+
+        if 'profiler' in state:
+            self._dump_profile(state['profiler'], endpoint)
+
+        response.headers.add('Server-Timing', f'app;dur={elapsed * 1000:.1f}')
+        response.headers.add('Server-Timing',
+                             f'db;dur={state["query_seconds"] * 1000:.1f};desc="{state["queries"]} queries"')
+        return response
+
+    def _teardown_request(self, exc):
+        # Requests that raised never reach after_request; stop their profiler
+        state = g.pop('instrumentation', None)
+        if state and 'profiler' in state:
+            self._stop_profiler(state['profiler'])
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'instrumentation' in g:
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not (has_request_context() and 'instrumentation' in g):
+            return
+        starts = conn.info.get('query_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        state = g.instrumentation
+        state['queries'] += 1
+        state['query_seconds'] += elapsed
+        state['statements'][statement] += 1
+        if elapsed >= self.slow_query_seconds:
+            self.metrics.observe_slow_query(request.endpoint or 'unknown')
+            logger.warning('Slow query (%.1f ms) in %s: %s', elapsed * 1000, request.endpoint, statement[:500])
+
+    def _start_profiler(self):
+        if self.profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logger.warning('pyinstrument is not installed; falling back to cProfile')
+            else:
+                profiler = Profiler()
+                profiler.start()
+                return profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, profiler):
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+        else:
+            profiler.stop()
+
+    def _dump_profile(self, profiler, endpoint):
+        self._stop_profiler(profiler)
+        os.makedirs(self.profile_dir, exist_ok=True)
+        stem = os.path.join(self.profile_dir, f'{endpoint}_{time.strftime("%Y%m%d_%H%M%S")}_{id(profiler):x}')
+        if isinstance(profiler, cProfile.Profile):
+            profiler.dump_stats(stem + '.prof')
+        else:
+            with open(stem + '.html', 'w') as f:
+                f.write(profiler.output_html())
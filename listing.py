@@ -0,0 +1,143 @@
+"""Column-projected student listings that stay bounded as enrollment grows."""
+import base64
+import json
+from collections import namedtuple
+
+from sqlalchemy import func, tuple_
+
+from models import db, Course, Student
+from money import literal_amount
+
+DEFAULT_PER_PAGE = 25
+MAX_PER_PAGE = 200
+
+# Only the columns the listing pages actually render
+LISTING_COLUMNS = (
+    Student.id,
+    Student.enrollment_number,
+    Student.first_name,
+    Student.last_name,
+    Student.phone,
+    Student.email,
+    Student.course_id,
+    Student.total_fees,
+    Student.paid_fees,
+    Student.remaining_fees,
+)
+
+StudentRow = namedtuple('StudentRow', [column.key for column in LISTING_COLUMNS])
+CourseGroup = namedtuple('CourseGroup', [
+    'id', 'name', 'duration', 'total_fees', 'students', 'student_count', 'page', 'pages'
+])
+
+
+def clamp_per_page(per_page):
+    if not per_page or per_page < 1:
+        return DEFAULT_PER_PAGE
+    return min(per_page, MAX_PER_PAGE)
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    # Every key column we seek on is numeric
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def fetch_page(query, limit, key):
+    """Run an ordered query for limit rows plus the cursor of the following page."""
+    rows = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(key(rows[limit - 1])) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def pending_fees_page(cursor=None, limit=DEFAULT_PER_PAGE):
+    """Students with pending fees, highest remaining first, seeking on (remaining_fees, id)."""
+    limit = clamp_per_page(limit)
+    query = db.session.query(*LISTING_COLUMNS, Course.name.label('course_name')).join(
+        Course, Student.course_id == Course.id
+    ).filter(Student.remaining_fees > 0)
+    if cursor:
+        remaining_fees, student_id = decode_cursor(cursor, 2)
+        query = query.filter(
+            # Row values don't infer each other's types, so bind the amount as Money
+            tuple_(Student.remaining_fees, Student.id) < tuple_(literal_amount(remaining_fees), student_id)
+        )
+    query = query.order_by(Student.remaining_fees.desc(), Student.id.desc())
+    return fetch_page(query, limit, lambda row: (row.remaining_fees, row.id))
+
+
+def course_students_page(course_id, cursor=None, limit=DEFAULT_PER_PAGE):
+    """Students of one course in id order, seeking on (course_id, id)."""
+    limit = clamp_per_page(limit)
+    query = db.session.query(*LISTING_COLUMNS).filter(Student.course_id == course_id)
+    if cursor:
+        cursor_course_id, student_id = decode_cursor(cursor, 2)
+        if cursor_course_id != course_id:
+            raise ValueError('Cursor belongs to a different course')
+        query = query.filter(Student.id > student_id)
+    query = query.order_by(Student.id)
+    return fetch_page(query, limit, lambda row: (row.course_id, row.id))
+
+
+def students_by_course(page=1, per_page=DEFAULT_PER_PAGE):
+    """Return one CourseGroup per course holding the requested page of its students.
+
+    Always two queries: the course list with each course's student count,
+    and a windowed student query that numbers rows within each course so only
+    the requested slice is loaded.
+    """
+    page = max(page or 1, 1)
+    per_page = clamp_per_page(per_page)
+    first, last = (page - 1) * per_page, page * per_page
+
+    # Counted apart from the page, so courses with no students on it still report their total
+    totals = db.session.query(
+        Student.course_id, func.count(Student.id).label('student_count')
+    ).group_by(Student.course_id).subquery()
+    courses = db.session.query(
+        Course.id, Course.name, Course.duration, Course.total_fees,
+        func.coalesce(totals.c.student_count, 0).label('student_count')
+    ).outerjoin(totals, totals.c.course_id == Course.id).order_by(Course.id).all()
+
+    position = func.row_number().over(
+        partition_by=Student.course_id, order_by=Student.id
+    ).label('position')
+    numbered = db.session.query(*LISTING_COLUMNS, position).subquery()
+
+    rows = db.session.query(numbered).filter(
+        numbered.c.position > first,
+        numbered.c.position <= last
+    ).order_by(numbered.c.course_id, numbered.c.position).all()
+
+    students = {course.id: [] for course in courses}
+    for row in rows:
+        students.setdefault(row.course_id, []).append(StudentRow(*row[:len(StudentRow._fields)]))
+
+    groups = []
+    for course in courses:
+        student_count = course.student_count
+        groups.append(CourseGroup(
+            id=course.id,
+            name=course.name,
+            duration=course.duration,
+            total_fees=course.total_fees,
+            students=students[course.id],
+            student_count=student_count,
+            page=page,
+            pages=max((student_count + per_page - 1) // per_page, 1),
+        ))
+    return groups
@@ -0,0 +1,177 @@
+"""Versioned schema migrations for databases created before a model change.
+
+db.create_all() only creates missing tables, so anything added to an
+existing table (indexes, columns, triggers) is applied here. Each migration
+runs once, in version order, and is recorded in the schema_version table.
+"""
+from datetime import datetime
+
+from sqlalchemy import Integer, inspect, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from models import db, Course, CourseFeeSummary, EnrollmentCounter, Payment, Student
+import search
+import summary
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return func
+    return register
+
+
+def _ensure_version_table(connection):
+    connection.execute(text(
+        'CREATE TABLE IF NOT EXISTS schema_version ('
+        'version INTEGER PRIMARY KEY, '
+        'description VARCHAR(200) NOT NULL, '
+        'applied_at TIMESTAMP NOT NULL)'
+    ))
+
+
+def create_index(connection, index):
+    # Reflection cannot see expression indexes, so checkfirst is not reliable here
+    ddl = str(CreateIndex(index).compile(dialect=connection.dialect))
+    connection.execute(text(ddl.replace('CREATE INDEX', 'CREATE INDEX IF NOT EXISTS', 1)))
+
+
+def current_version(connection):
+    _ensure_version_table(connection)
+    return connection.execute(text('SELECT MAX(version) FROM schema_version')).scalar() or 0
+
+
+def pending(engine=None):
+    """Return the versions of migrations not yet applied."""
+    engine = engine or db.engine
+    with engine.begin() as connection:
+        version = current_version(connection)
+    return [target for target, _, _ in MIGRATIONS if target > version]
+
+
+def upgrade(engine=None):
+    """Apply all pending migrations and return the list of versions applied."""
+    engine = engine or db.engine
+    applied = []
+    with engine.begin() as connection:
+        version = current_version(connection)
+    for target, description, func in MIGRATIONS:
+        if target <= version:
+            continue
+        with engine.begin() as connection:
+            if connection.dialect.name == 'sqlite' and not connection.connection.in_transaction:
+                # pysqlite only opens a transaction before DML, so schema changes
+                # would otherwise commit one statement at a time
+                connection.exec_driver_sql('BEGIN')
+            func(connection)
+            connection.execute(
+                text('INSERT INTO schema_version (version, description, applied_at) '
+                     'VALUES (:version, :description, :applied_at)'),
+                {'version': target, 'description': description, 'applied_at': datetime.now()}
+            )
+        applied.append(target)
+    return applied
+
+
+@migration(1, 'Indexes for course listings and pending fees')
+def add_student_indexes(connection):
+    names = {
+        'ix_student_course_id_id',
+        'ix_student_pending_fees',
+    }
+    for index in Student.__table__.indexes:
+        if index.name in names:
+            create_index(connection, index)
+
+
+@migration(2, 'Full-text search index over student names and contact details')
+def add_student_fts(connection):
+    # Backends without FTS5 keep using the ilike search path
+    if search.fts_supported(connection):
+        search.create_fts_index(connection)
+
+
+@migration(3, 'Per-year enrollment number counters')
+def add_enrollment_counter(connection):
+    EnrollmentCounter.__table__.create(connection, checkfirst=True)
+
+
+@migration(4, 'Payment ledger')
+def add_payment_ledger(connection):
+    Payment.__table__.create(connection, checkfirst=True)
+
+
+@migration(5, 'Per-course fee summary table')
+def add_course_fee_summary(connection):
+    CourseFeeSummary.__table__.create(connection, checkfirst=True)
+    summary.rebuild(connection)
+
+
+MONEY_COLUMNS = (
+    (Course, ('total_fees',)),
+    (Student, ('total_fees', 'paid_fees', 'remaining_fees')),
+    (Payment, ('amount',)),
+)
+
+
+def _sqlite_table_to_paise(connection, table, money_columns, existing):
+    """Rebuild an SQLite table from its model, copying amounts over as paise.
+
+    SQLite cannot change a column's type in place, so this follows its
+    documented procedure: create the new table, copy, drop the old one and
+    rename. The result matches the model's DDL exactly.
+    """
+    temporary = f'{table.name}_new'
+    ddl = str(CreateTable(table).compile(dialect=connection.dialect)).strip()
+    connection.execute(text(ddl.replace(f'CREATE TABLE {table.name} (', f'CREATE TABLE {temporary} (', 1)))
+    names = [column.name for column in table.columns if column.name in existing]
+    values = [f'CAST(ROUND({name} * 100) AS INTEGER)' if name in money_columns else name for name in names]
+    connection.execute(text(
+        f'INSERT INTO {temporary} ({", ".join(names)}) SELECT {", ".join(values)} FROM {table.name}'
+    ))
+    connection.execute(text(f'DROP TABLE {table.name}'))
+    # Legacy mode renames without re-checking views and triggers that name the dropped table
+    connection.execute(text('PRAGMA legacy_alter_table = ON'))
+    connection.execute(text(f'ALTER TABLE {temporary} RENAME TO {table.name}'))
+    connection.execute(text('PRAGMA legacy_alter_table = OFF'))
+    for index in table.indexes:
+        create_index(connection, index)
+
+
+@migration(6, 'Fee amounts stored as integer paise')
+def money_to_paise(connection):
+    inspector = inspect(connection)
+    for model, money_columns in MONEY_COLUMNS:
+        table = model.__table__
+        existing = {column['name']: column['type'] for column in inspector.get_columns(table.name)}
+        # Tables created from the current models already hold paise
+        if all(isinstance(existing[name], Integer) for name in money_columns):
+            continue
+        if connection.dialect.name == 'sqlite':
+            _sqlite_table_to_paise(connection, table, money_columns, existing)
+        else:
+            for name in money_columns:
+                connection.execute(text(
+                    f'ALTER TABLE {table.name} ALTER COLUMN {name} TYPE BIGINT '
+                    f'USING CAST(ROUND({name} * 100) AS BIGINT)'
+                ))
+    # Dropping the old student table took the full-text sync triggers with it
+    if search.fts_supported(connection) and inspector.has_table('student_fts'):
+        search.create_fts_index(connection)
+
+    # The summary is derived data: recreate it with integer columns and refill it
+    summary_types = [column['type'] for column in inspector.get_columns(CourseFeeSummary.__tablename__)]
+    if not all(isinstance(column_type, Integer) for column_type in summary_types):
+        CourseFeeSummary.__table__.drop(connection)
+        CourseFeeSummary.__table__.create(connection)
+    summary.rebuild(connection)
+
+
+@migration(7, 'Drop the unused lower(name) indexes')
+def drop_name_indexes(connection):
+    # Name search is a full-text match or a '%term%' ilike; neither can seek these
+    for name in ('ix_student_first_name_lower', 'ix_student_last_name_lower'):
+        connection.execute(text(f'DROP INDEX IF EXISTS {name}'))
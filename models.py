@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from flask_login import UserMixin
+
+from money import Money
+from routing import RoutingSQLAlchemy
+
+db = RoutingSQLAlchemy()
+
+# Database Models
+class Admin(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    password_hash = db.Column(db.String(120), nullable=False)
+
+class Course(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    duration = db.Column(db.String(50), nullable=False)  
+    total_fees = db.Column(Money, nullable=False)
+    description = db.Column(db.Text)
+    students = db.relationship('Student', backref='course', lazy=True)
+
+class Student(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    enrollment_number = db.Column(db.String(20), unique=True, nullable=False)
+    first_name = db.Column(db.String(50), nullable=False)
+    last_name = db.Column(db.String(50), nullable=False)
+    date_of_birth = db.Column(db.Date, nullable=False)
+    gender = db.Column(db.String(10), nullable=False)
+    father_name = db.Column(db.String(100), nullable=False)
+    mother_name = db.Column(db.String(100), nullable=False)
+    address = db.Column(db.Text, nullable=False)
+    phone = db.Column(db.String(15), nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    admission_date = db.Column(db.Date, nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('course.id'), nullable=False)
+    total_fees = db.Column(Money, nullable=False)
+    paid_fees = db.Column(Money, default=0)
+    remaining_fees = db.Column(Money, nullable=False)
+    payments = db.relationship('Payment', backref='student', lazy='dynamic',
+                               cascade='all, delete-orphan')
+
+    __table_args__ = (
+        # Course listings seek on (course_id, id)
+        db.Index('ix_student_course_id_id', 'course_id', 'id'),
+        # Fee dashboard only ever reads students who still owe fees
+        db.Index('ix_student_pending_fees', 'remaining_fees', 'id',
+                 sqlite_where=db.text('remaining_fees > 0'),
+                 postgresql_where=db.text('remaining_fees > 0')),
+    )
+
+class EnrollmentCounter(db.Model):
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    last_number = db.Column(db.Integer, nullable=False, default=0)
+
+class Payment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False, index=True)
+    amount = db.Column(Money, nullable=False)
+    paid_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    admin_id = db.Column(db.Integer, db.ForeignKey('admin.id'))
+
+    __table_args__ = (
+        # Recent payments feed pages on (paid_at, id) descending
+        db.Index('ix_payment_paid_at_id', 'paid_at', 'id'),
+    )
+
+class CourseFeeSummary(db.Model):
+    course_id = db.Column(db.Integer, db.ForeignKey('course.id'), primary_key=True, autoincrement=False)
+    student_count = db.Column(db.Integer, nullable=False, default=0)
+    total_billed = db.Column(Money, nullable=False, default=0)
+    total_paid = db.Column(Money, nullable=False, default=0)
+    total_remaining = db.Column(Money, nullable=False, default=0)
@@ -0,0 +1,78 @@
+"""Money held as integer paise.
+
+Fee and payment columns are stored as whole paise (BIGINT), so balances,
+sums and the per-course summary are exact integers in the database. The
+Money column type converts at the boundary: Python code and templates keep
+working in rupees, and every rupee value bound to a Money column or added
+to one is rounded to the nearest paisa first.
+"""
+import math
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import BigInteger, Float, cast, func, literal, type_coerce
+from sqlalchemy.sql import operators
+from sqlalchemy.types import TypeDecorator
+
+PAISE = 100
+
+# Multiplying or dividing money by a number binds the number as it is,
+# not as an amount of rupees to be converted to paise
+_SCALAR_OPERATORS = {operators.mul, operators.truediv, operators.div, operators.mod}
+
+
+def to_paise(rupees):
+    """Whole paise for a rupee amount, rounding half a paisa up."""
+    if not math.isfinite(rupees):
+        raise ValueError(f'Invalid amount {rupees!r}')
+    return int((Decimal(str(rupees)) * PAISE).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_rupees(paise):
+    return int(paise) / PAISE
+
+
+def rupees(value):
+    """Round a rupee amount to the nearest paisa."""
+    return to_rupees(to_paise(value))
+
+
+def discounted(fee, percent):
+    """fee less percent, to the nearest paisa."""
+    paise = Decimal(to_paise(fee)) * (100 - Decimal(str(percent))) / 100
+    return to_rupees(paise.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+class Money(TypeDecorator):
+    impl = BigInteger
+    cache_ok = True
+
+    class Comparator(TypeDecorator.Comparator, BigInteger.Comparator):
+        def _adapt_expression(self, op, other_comparator):
+            # Sums and differences of amounts are amounts, read back in rupees
+            if op in (operators.add, operators.sub):
+                return op, self.type
+            return super()._adapt_expression(op, other_comparator)
+
+    comparator_factory = Comparator
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_paise(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else to_rupees(value)
+
+    def coerce_compared_value(self, op, value):
+        if op in _SCALAR_OPERATORS:
+            return Float()
+        return self
+
+
+def scaled(amount, factor):
+    """SQL for a Money expression multiplied by factor, rounded to whole paise."""
+    paise = func.round(type_coerce(amount, BigInteger) * literal(factor, Float()))
+    return type_coerce(cast(paise, BigInteger), Money())
+
+
+def literal_amount(value):
+    """A rupee amount as a Money SQL literal."""
+    return literal(value, Money())
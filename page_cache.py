@@ -0,0 +1,215 @@
+"""Rendered-page cache for the student and course views, with ETag revalidation.
+
+Each cached page is keyed by its URL, the viewing admin and the current
+version of every entity it shows:
+
+- a student's version, for the details and report pages
+- a course's version, for a course's student list
+- a global students version, for the all-courses listing
+
+Write paths bump those versions, so stale entries are never looked up
+again; the TTL only reclaims them. Versions also make the ETag, so a
+browser revalidating an unchanged page gets its 304 without a query or a
+render. Cached pages are always rendered from the primary, so a lagging
+replica can't be stored under a version that was just bumped.
+
+The default backend is an in-process LRU, so each worker has its own copy
+and its own versions, and never sees another worker's bumps. Its versions
+therefore expire with the TTL like the pages do: a stale page or 304 from
+another worker is bounded by PAGE_CACHE_TTL. Point PAGE_CACHE_BACKEND at
+Redis (redis://...) to share versions and pages across workers.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import g, make_response, request, session
+from flask_login import current_user
+from sqlalchemy import event
+
+from models import Course
+
+DEFAULT_TTL = 300
+
+
+class LRUBackend:
+    shared = False
+
+    def __init__(self, maxsize=2048):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def incr(self, key, ttl=None):
+        # An evicted or expired counter restarts from the clock, never from a value an old key used
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and time.monotonic() >= entry[1]:
+                entry = None
+            value = (entry[0] if entry else time.time_ns()) + 1
+            self._entries[key] = (value, time.monotonic() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    shared = True
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError('A redis:// PAGE_CACHE_BACKEND needs the redis package: pip install redis') from e
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def get_many(self, keys):
+        return self.client.mget(keys)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(key, value, ex=ttl)
+
+    def incr(self, key, ttl=None):
+        pipe = self.client.pipeline()
+        pipe.set(key, time.time_ns(), nx=True)
+        pipe.incr(key)
+        return pipe.execute()[1]
+
+    def clear(self):
+        self.client.flushdb()
+
+
+def make_backend(spec, maxsize):
+    if not spec or spec == 'lru':
+        return LRUBackend(maxsize)
+    if spec.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(spec)
+    raise ValueError(f"Unknown PAGE_CACHE_BACKEND {spec!r}; use 'lru' or a redis:// URL")
+
+
+class PageCache:
+    def __init__(self, app=None):
+        self.backend = LRUBackend()
+        self.ttl = DEFAULT_TTL
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        event.listen(Course, 'after_update', self._on_course_change)
+        event.listen(Course, 'after_delete', self._on_course_change)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('PAGE_CACHE_ENABLED', True)
+        self.ttl = app.config.get('PAGE_CACHE_TTL', DEFAULT_TTL)
+        self.backend = make_backend(app.config.get('PAGE_CACHE_BACKEND'), app.config.get('PAGE_CACHE_SIZE', 2048))
+        app.extensions['page_cache'] = self
+
+    @property
+    def version_ttl(self):
+        # Versions only this worker can bump must not outlive the pages they validate
+        return None if self.backend.shared else self.ttl
+
+    def versions(self, entities):
+        keys = [f'version:{kind}:{entity_id}' for kind, entity_id in entities]
+        values = self.backend.get_many(keys)
+        for i, value in enumerate(values):
+            if value is None:
+                values[i] = self.backend.incr(keys[i], self.version_ttl)
+        return [int(value) for value in values]
+
+    def bump(self, kind, entity_id=0):
+        self.backend.incr(f'version:{kind}:{entity_id}', self.version_ttl)
+
+    def student_changed(self, student_id, *course_ids):
+        """Invalidate pages showing this student: their own, their courses' lists and the full listing."""
+        self.bump('student', student_id)
+        for course_id in set(course_ids):
+            if course_id is not None:
+                self.bump('course', course_id)
+        self.bump('students')
+
+    def students_changed(self, course_ids=()):
+        """Invalidate list pages after changes to many students at once."""
+        for course_id in set(course_ids):
+            self.bump('course', course_id)
+        self.bump('students')
+        self.bump('epoch')
+
+    def _on_course_change(self, mapper, connection, target):
+        # Course names and fees appear on every cached page
+        self.bump('epoch')
+
+    def cached(self, entities):
+        """Cache a view's rendered response; entities(**view_args) lists the (kind, id) pairs it shows."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # Pending flash messages are rendered into the page once, so it can't be shared
+                if not self.enabled or request.method != 'GET' or session.get('_flashes'):
+                    return view(*args, **kwargs)
+
+                shown = list(entities(**kwargs)) + [('epoch', 0)]
+                signature = '|'.join([request.full_path, str(current_user.get_id())] +
+                                     [f'{kind}:{entity_id}:{version}' for (kind, entity_id), version
+                                      in zip(shown, self.versions(shown))])
+                etag = hashlib.sha1(signature.encode()).hexdigest()
+                if etag in request.if_none_match:
+                    self.not_modified += 1
+                    response = make_response('', 304)
+                    response.set_etag(etag)
+                    return response
+
+                key = f'page:{etag}'
+                body = self.backend.get(key)
+                if body is None:
+                    self.misses += 1
+                    # Whatever is stored under the current versions must not come from a lagging replica
+                    g.read_replica = False
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or session.get('_flashes'):
+                        return response
+                    self.backend.set(key, response.get_data(), self.ttl)
+                else:
+                    self.hits += 1
+                    response = make_response(body)
+                response.set_etag(etag)
+                response.cache_control.private = True
+                response.cache_control.no_cache = True
+                return response
+            return wrapper
+        return decorator
+
+    def metrics(self):
+        return {'hits': self.hits, 'misses': self.misses, 'not_modified': self.not_modified}
@@ -0,0 +1,72 @@
+"""Password hashing with configurable cost, run in a bounded thread pool.
+
+PBKDF2 spends its time inside hashlib with the GIL released, so handing it
+to a small pool caps how many cores a burst of logins can occupy while the
+request threads stay free to serve other pages. Hashing new passwords goes
+through the same pool. When more hashes are waiting than the pool allows,
+new ones fail fast with LoginBusy instead of queueing without limit.
+
+Stored hashes carry the method they were made with. After a successful
+login, a hash made with other parameters than the configured ones is
+replaced.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_ALGORITHM = 'sha256'
+DEFAULT_ITERATIONS = 260000
+
+
+class LoginBusy(RuntimeError):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        self.method = f'pbkdf2:{DEFAULT_ALGORITHM}:{DEFAULT_ITERATIONS}'
+        self.executor = None
+        self._slots = None
+        self._dummy_hash = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        algorithm = app.config.get('PASSWORD_HASH_ALGORITHM', DEFAULT_ALGORITHM)
+        iterations = int(app.config.get('PASSWORD_HASH_ITERATIONS', DEFAULT_ITERATIONS))
+        workers = int(app.config.get('PASSWORD_HASH_WORKERS', 2))
+        self.method = f'pbkdf2:{algorithm}:{iterations}'
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+        self._slots = threading.BoundedSemaphore(workers * int(app.config.get('PASSWORD_HASH_QUEUE', 8)))
+        app.extensions['password_hasher'] = self
+
+    def _run(self, func, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise LoginBusy('Too many logins in progress')
+        try:
+            return self.executor.submit(func, *args, **kwargs).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, method=self.method)
+
+    def needs_rehash(self, password_hash):
+        return password_hash.split('$', 1)[0] != self.method
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def verify_missing(self, password):
+        # Spend the same time on unknown usernames so response times don't reveal which exist
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash('missing')
+        self.verify(self._dummy_hash, password)
+        return False
+
+
+def hash_password(password):
+    hasher = current_app.extensions.get('password_hasher')
+    return hasher.hash(password) if hasher else generate_password_hash(password)
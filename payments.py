@@ -0,0 +1,73 @@
+"""Fee payments recorded in a ledger and posted with a conditional UPDATE.
+
+The balance check and the balance change are the same statement
+(... WHERE remaining_fees >= :amount), so two concurrent payments can never
+both pass the check against a stale balance, and no row lock is held
+across Python code.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, tuple_, update
+
+from models import db, Course, Payment, Student
+from listing import clamp_per_page, decode_cursor, fetch_page
+from money import rupees
+import summary
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class PaymentError(ValueError):
+    pass
+
+
+def post_payment(student_id, amount, admin_id=None, paid_at=None):
+    """Apply amount to a student's fees and record it; commits and returns the Payment.
+
+    Raises PaymentError without changing anything if the amount is not
+    positive or exceeds the student's remaining fees.
+    """
+    amount = rupees(amount)
+    if amount <= 0:
+        raise PaymentError('Please enter a valid amount greater than 0')
+    try:
+        result = db.session.execute(
+            update(Student)
+            .where(Student.id == student_id, Student.remaining_fees >= amount)
+            .values(paid_fees=func.coalesce(Student.paid_fees, 0) + amount,
+                    remaining_fees=Student.remaining_fees - amount)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise PaymentError('Amount exceeds remaining fees')
+        summary.apply_payment(student_id, amount)
+        payment = Payment(student_id=student_id, amount=amount, admin_id=admin_id,
+                          paid_at=paid_at or datetime.now())
+        db.session.add(payment)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return payment
+
+
+def recent_payments(cursor=None, limit=20):
+    """Latest payments first with student details, seeking on (paid_at, id)."""
+    limit = clamp_per_page(limit)
+    query = db.session.query(
+        Payment.id,
+        Payment.amount,
+        Payment.paid_at,
+        Payment.student_id,
+        Student.enrollment_number,
+        Student.first_name,
+        Student.last_name,
+        Course.name.label('course_name'),
+    ).join(Student, Payment.student_id == Student.id).join(Course, Student.course_id == Course.id)
+    if cursor:
+        paid_at, payment_id = decode_cursor(cursor, 2)
+        paid_at = EPOCH + timedelta(microseconds=paid_at)
+        query = query.filter(tuple_(Payment.paid_at, Payment.id) < tuple_(paid_at, payment_id))
+    query = query.order_by(Payment.paid_at.desc(), Payment.id.desc())
+    # Timestamps go into the cursor as exact integer microseconds
+    return fetch_page(query, limit, lambda row: ((row.paid_at - EPOCH) // timedelta(microseconds=1), row.id))
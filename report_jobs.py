@@ -0,0 +1,210 @@
+"""Background PDF report jobs.
+
+Reports are built on a small thread pool outside the request, from live
+data, and each job writes to its own file under REPORT_DIR, so concurrent
+requests never overwrite each other's output. Job state is kept in memory
+per process; the most recent MAX_JOBS jobs are remembered.
+"""
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import g
+
+from models import db, Course, CourseFeeSummary, Payment, Student
+
+REPORT_KINDS = ('project', 'fees', 'statements')
+STATEMENT_FORMATS = ('pdf', 'zip')
+MAX_JOBS = 200
+STREAM_CHUNK_SIZE = 1000
+
+
+class ReportJob:
+    def __init__(self, kind, params=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.status = 'queued'
+        self.path = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.finished_at = None
+
+    @property
+    def filename(self):
+        extension = self.params.get('format', 'pdf')
+        return f"{self.kind}_report_{self.created_at:%Y%m%d_%H%M%S}_{self.id[:8]}.{extension}"
+
+    @property
+    def mimetype(self):
+        return 'application/zip' if self.filename.endswith('.zip') else 'application/pdf'
+
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'params': self.params,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+def build_project_report(path):
+    from generate_report import generate_project_report
+
+    courses = db.session.query(Course.name, Course.duration, Course.total_fees).order_by(Course.id).all()
+    return generate_project_report(path, courses=courses)
+
+
+def build_fee_report(path):
+    from generate_report import generate_fee_report
+
+    course_totals = db.session.query(
+        Course.name, CourseFeeSummary.student_count, CourseFeeSummary.total_paid,
+        CourseFeeSummary.total_remaining
+    ).join(CourseFeeSummary, CourseFeeSummary.course_id == Course.id).order_by(Course.id).all()
+    students = db.session.query(
+        Student.enrollment_number,
+        Student.first_name + ' ' + Student.last_name,
+        Course.name,
+        Student.total_fees,
+        Student.paid_fees,
+        Student.remaining_fees,
+    ).join(Course, Student.course_id == Course.id).order_by(
+        Student.course_id, Student.id
+    ).yield_per(STREAM_CHUNK_SIZE)
+    return generate_fee_report(path, iter(students), course_totals=course_totals)
+
+
+def _statement(row, payments):
+    return {
+        'enrollment_number': row.enrollment_number,
+        'name': f"{row.first_name} {row.last_name}",
+        'father_name': row.father_name,
+        'course_name': row.course_name,
+        'admission_date': row.admission_date,
+        'total_fees': row.total_fees,
+        'paid_fees': row.paid_fees,
+        'remaining_fees': row.remaining_fees,
+        'payments': payments,
+    }
+
+
+def _statement_query():
+    return db.session.query(
+        Student.id,
+        Student.enrollment_number,
+        Student.first_name,
+        Student.last_name,
+        Student.father_name,
+        Student.admission_date,
+        Student.total_fees,
+        Student.paid_fees,
+        Student.remaining_fees,
+        Course.name.label('course_name'),
+    ).join(Course, Student.course_id == Course.id)
+
+
+def _payments_by_student(student_ids):
+    payments = {student_id: [] for student_id in student_ids}
+    rows = db.session.query(Payment.student_id, Payment.paid_at, Payment.amount).filter(
+        Payment.student_id.in_(student_ids)
+    ).order_by(Payment.student_id, Payment.paid_at)
+    for student_id, paid_at, amount in rows:
+        payments[student_id].append((paid_at, amount))
+    return payments
+
+
+def student_statement(student_id):
+    """Statement data for one student, or None if there is no such student."""
+    row = _statement_query().filter(Student.id == student_id).first()
+    if row is None:
+        return None
+    return _statement(row, _payments_by_student([student_id])[student_id])
+
+
+def course_statements(course_id, chunk_size=500):
+    """Yield statement dicts for every student of a course, loading payments per chunk."""
+    rows = _statement_query().filter(Student.course_id == course_id).order_by(Student.id)
+    last_id = 0
+    while True:
+        chunk = rows.filter(Student.id > last_id).limit(chunk_size).all()
+        if not chunk:
+            return
+        payments = _payments_by_student([row.id for row in chunk])
+        for row in chunk:
+            yield _statement(row, payments[row.id])
+        last_id = chunk[-1].id
+
+
+def build_course_statements(path, course_id, format='pdf', workers=None):
+    from report_rendering import render_statements_pdf, render_statements_zip
+
+    if db.session.get(Course, course_id) is None:
+        raise ValueError(f"Course {course_id} does not exist")
+    statements = course_statements(course_id)
+    if format == 'zip':
+        return render_statements_zip(statements, path, workers=workers)
+    return render_statements_pdf(statements, path)
+
+
+BUILDERS = {
+    'project': build_project_report,
+    'fees': build_fee_report,
+    'statements': build_course_statements,
+}
+
+
+class ReportJobs:
+    def __init__(self, app=None):
+        self.app = None
+        self.executor = None
+        self.output_dir = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.output_dir = app.config.get('REPORT_DIR') or os.path.join(app.instance_path, 'reports')
+        self.executor = ThreadPoolExecutor(max_workers=app.config.get('REPORT_WORKERS', 2),
+                                           thread_name_prefix='report')
+
+    def submit(self, kind, **params):
+        if kind not in BUILDERS:
+            raise ValueError(f"Unknown report kind {kind!r}")
+        job = ReportJob(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > MAX_JOBS:
+                self._jobs.popitem(last=False)
+        self.executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job):
+        job.status = 'running'
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, job.filename)
+        try:
+            with self.app.app_context():
+                g.read_replica = True
+                BUILDERS[job.kind](path, **job.params)
+            job.path = path
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            if os.path.exists(path):
+                os.remove(path)
+        finally:
+            job.finished_at = datetime.now()
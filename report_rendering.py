@@ -0,0 +1,291 @@
+"""Shared reportlab styles and fee statement rendering.
+
+Styles, table styles and fonts are built once per process and reused by
+every report, so rendering thousands of statements does not rebuild the
+stylesheet for each one. Course batches are rendered either as one PDF or
+as a zip of per-student PDFs produced by a process pool.
+
+The pool's processes are started with forkserver (spawn where that is not
+available) rather than forked from a threaded web worker, and only a few
+chunks per process are in flight, so statements are loaded from the
+database about as fast as they are rendered.
+"""
+import io
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+
+FONT_CANDIDATES = (
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/TTF/DejaVuSans.ttf', '/usr/share/fonts/TTF/DejaVuSans-Bold.ttf'),
+    ('C:/Windows/Fonts/arial.ttf', 'C:/Windows/Fonts/arialbd.ttf'),
+)
+
+# Statements rendered per task when a course batch is split across processes
+STATEMENTS_PER_TASK = 50
+
+# Chunks submitted to the pool per worker process before waiting for results
+CHUNKS_IN_FLIGHT = 2
+
+
+class FlowableStream:
+    """List-like view over a flowable iterator for doc.build().
+
+    platypus only ever works at the front of the flowable list, so a small
+    look-ahead buffer is enough and the full list never has to exist.
+    """
+    LOOKAHEAD = 8
+
+    def __init__(self, flowables):
+        self._source = iter(flowables)
+        self._buffer = []
+
+    def _fill(self):
+        while self._source is not None and len(self._buffer) < self.LOOKAHEAD:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        self._fill()
+        return self._buffer[index]
+
+    def __setitem__(self, index, value):
+        self._buffer[index] = value
+
+    def __delitem__(self, index):
+        self._fill()
+        del self._buffer[index]
+
+    def insert(self, index, value):
+        self._buffer.insert(index, value)
+
+
+@lru_cache(maxsize=None)
+def fonts():
+    """Register a TrueType font with a rupee glyph if one is available.
+
+    Returns (regular, bold, currency symbol). The built-in Helvetica has no
+    rupee sign, so without a TrueType font amounts are prefixed with "Rs.".
+    """
+    configured = os.environ.get('REPORT_FONT'), os.environ.get('REPORT_FONT_BOLD')
+    for regular, bold in (configured,) + FONT_CANDIDATES:
+        if regular and bold and os.path.exists(regular) and os.path.exists(bold):
+            pdfmetrics.registerFont(TTFont('ReportSans', regular))
+            pdfmetrics.registerFont(TTFont('ReportSans-Bold', bold))
+            return 'ReportSans', 'ReportSans-Bold', '₹'
+    return 'Helvetica', 'Helvetica-Bold', 'Rs. '
+
+
+@lru_cache(maxsize=None)
+def styles():
+    regular, bold, _ = fonts()
+    sheet = getSampleStyleSheet()
+    for name in ('Normal', 'BodyText'):
+        sheet[name].fontName = regular
+    for name in ('Title', 'Heading1', 'Heading2', 'Heading3'):
+        sheet[name].fontName = bold
+    sheet.add(ParagraphStyle('CustomTitle', parent=sheet['Heading1'], fontSize=24, spaceAfter=30))
+    sheet.add(ParagraphStyle('Date', parent=sheet['Normal'], fontSize=10, textColor=colors.gray))
+    sheet.add(ParagraphStyle('Small', parent=sheet['Normal'], fontSize=8, textColor=colors.gray))
+    return sheet
+
+
+@lru_cache(maxsize=None)
+def grid_table_style():
+    """The grey-header, beige-body table used by the project report."""
+    regular, bold, _ = fonts()
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), bold),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), regular),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+
+@lru_cache(maxsize=None)
+def data_table_style():
+    """Compact striped table for long listings; amount columns from 3 on are right-aligned."""
+    regular, bold, _ = fonts()
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), bold),
+        ('FONTNAME', (0, 1), (-1, -1), regular),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ALIGN', (3, 0), (-1, -1), 'RIGHT'),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.beige]),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+    ])
+
+
+@lru_cache(maxsize=None)
+def statement_table_style():
+    regular, bold, _ = fonts()
+    return TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), regular),
+        ('FONTNAME', (0, 0), (0, -1), bold),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('LINEBELOW', (0, -1), (-1, -1), 1, colors.black),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ])
+
+
+def money(amount):
+    return f"{fonts()[2]}{amount or 0:,.2f}"
+
+
+def statement_flowables(statement):
+    """Flowables for one student's fee statement.
+
+    statement is a plain dict (so it can be sent to worker processes) with
+    enrollment_number, name, father_name, course_name, admission_date,
+    total_fees, paid_fees, remaining_fees and payments, a list of
+    (paid_at, amount) tuples.
+    """
+    sheet = styles()
+    flowables = [
+        Paragraph("Fee Statement", sheet['Heading1']),
+        Paragraph(f"Generated on: {datetime.now():%Y-%m-%d %H:%M}", sheet['Date']),
+        Spacer(1, 12),
+    ]
+    details = Table([
+        ["Enrollment No.", statement['enrollment_number']],
+        ["Name", statement['name']],
+        ["Father's Name", statement['father_name']],
+        ["Course", statement['course_name']],
+        ["Admission Date", f"{statement['admission_date']:%d %b %Y}"],
+    ], colWidths=[1.8*inch, 4.2*inch], hAlign='LEFT')
+    details.setStyle(statement_table_style())
+    details.setStyle(TableStyle([('ALIGN', (1, 0), (1, -1), 'LEFT')]))
+    flowables += [details, Spacer(1, 16)]
+
+    fees = Table([
+        ["Total Fees", money(statement['total_fees'])],
+        ["Paid", money(statement['paid_fees'])],
+        ["Remaining", money(statement['remaining_fees'])],
+    ], colWidths=[1.8*inch, 1.6*inch], hAlign='LEFT')
+    fees.setStyle(statement_table_style())
+    flowables += [fees, Spacer(1, 16)]
+
+    if statement['payments']:
+        rows = [["Date", "Amount"]]
+        rows += [[f"{paid_at:%d %b %Y}", money(amount)] for paid_at, amount in statement['payments']]
+        payments = Table(rows, colWidths=[1.8*inch, 1.6*inch], hAlign='LEFT', repeatRows=1)
+        payments.setStyle(data_table_style())
+        flowables += [Paragraph("Payments", sheet['Heading3']), payments]
+    else:
+        flowables.append(Paragraph("No payments recorded.", sheet['Small']))
+    return flowables
+
+
+def _document(target):
+    return SimpleDocTemplate(target, pagesize=A4, rightMargin=54, leftMargin=54,
+                             topMargin=54, bottomMargin=54, pageCompression=1)
+
+
+def render_statement(statement):
+    """Render one fee statement and return the PDF bytes."""
+    buffer = io.BytesIO()
+    _document(buffer).build(statement_flowables(statement))
+    return buffer.getvalue()
+
+
+def render_statements_pdf(statements, target):
+    """Render an iterable of statements into one PDF, one student per page."""
+    def flowables():
+        for index, statement in enumerate(statements):
+            if index:
+                yield PageBreak()
+            yield from statement_flowables(statement)
+
+    _document(target).build(FlowableStream(flowables()))
+    return target
+
+
+def statement_filename(statement):
+    return f"{statement['enrollment_number']}.pdf"
+
+
+def _render_many(statements):
+    return [(statement_filename(statement), render_statement(statement)) for statement in statements]
+
+
+def _chunks(statements, size):
+    chunk = []
+    for statement in statements:
+        chunk.append(statement)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def render_statements_zip(statements, target, workers=None):
+    """Render each statement to its own PDF and zip them into target.
+
+    Statements are rendered STATEMENTS_PER_TASK at a time in a process pool
+    of workers processes (workers=1 renders in this process).
+    """
+    chunks = _chunks(statements, STATEMENTS_PER_TASK)
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_STORED) as archive:
+        if workers == 1:
+            _write_all(archive, map(_render_many, chunks))
+        else:
+            workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+                _write_all(archive, _bounded_map(pool, _render_many, chunks, workers * CHUNKS_IN_FLIGHT))
+    return target
+
+
+def _pool_context():
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    # The fork server imports reportlab once; pool processes fork from it ready to render
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _bounded_map(pool, func, items, window):
+    """Like pool.map, in order, but never more than window items submitted ahead of the results."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _write_all(archive, results):
+    # PDF streams are already compressed, so the zip only stores them
+    for rendered in results:
+        for filename, pdf in rendered:
+            archive.writestr(filename, pdf)
@@ -0,0 +1,67 @@
+"""Background report jobs and single student statements."""
+import io
+
+from flask import Blueprint, abort, current_app, flash, jsonify, redirect, request, send_file, url_for
+from flask_login import login_required
+
+from extensions import report_jobs
+from report_jobs import REPORT_KINDS, STATEMENT_FORMATS, student_statement
+
+bp = Blueprint('reports', __name__)
+
+
+@bp.route('/generate_report')
+@login_required
+def generate_report():
+    kind = request.args.get('kind', 'project')
+    if kind not in REPORT_KINDS:
+        flash(f'Unknown report type: {kind}', 'danger')
+        return redirect(url_for('dashboard.dashboard'))
+    params = {}
+    if kind == 'statements':
+        course_id = request.args.get('course_id', type=int)
+        format = request.args.get('format', 'pdf')
+        if not course_id or format not in STATEMENT_FORMATS:
+            flash('Please select a course and a pdf or zip format', 'danger')
+            return redirect(url_for('dashboard.dashboard'))
+        params = {'course_id': course_id, 'format': format,
+                  'workers': current_app.config['REPORT_WORKERS']}
+    # Reports are built in the background; poll report_status for the result
+    job = report_jobs.submit(kind, **params)
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify(job.as_dict()), 202
+    flash(f'Report generation started (job {job.id[:8]}).', 'success')
+    return redirect(url_for('dashboard.dashboard'))
+
+@bp.route('/reports/<job_id>')
+@login_required
+def report_status(job_id):
+    job = report_jobs.get(job_id)
+    if job is None:
+        abort(404)
+    status = job.as_dict()
+    if job.status == 'done':
+        status['download_url'] = url_for('reports.download_report', job_id=job.id)
+    return jsonify(status)
+
+@bp.route('/reports/<job_id>/download')
+@login_required
+def download_report(job_id):
+    job = report_jobs.get(job_id)
+    if job is None or job.status != 'done':
+        abort(404)
+    return send_file(job.path, mimetype=job.mimetype, as_attachment=True,
+                     download_name=job.filename)
+
+@bp.route('/student_statement/<int:student_id>')
+@login_required
+def student_statement_pdf(student_id):
+    # reportlab is only loaded once a statement is actually rendered
+    from report_rendering import render_statement
+
+    statement = student_statement(student_id)
+    if statement is None:
+        abort(404)
+    return send_file(io.BytesIO(render_statement(statement)), mimetype='application/pdf',
+                     download_name=f"{statement['enrollment_number']}.pdf")
+
@@ -0,0 +1,98 @@
+"""Send reads from reporting and dashboard routes to a replica database.
+
+Configure a replica with REPLICA_DATABASE_URL. It can be a real streaming
+replica or an SQLite copy refreshed with `flask replica-sync`. Views
+decorated with @read_replica, and background report jobs, run their SELECTs
+on the replica. Everything else stays on the primary: writes, flushes, DML
+statements, and sessions that already wrote in the current transaction.
+
+A replica lags behind the primary, so any commit made during a request
+pins that browser session to the primary for REPLICA_LAG_SECONDS. An admin
+who has just taken a payment therefore sees it on the next page.
+"""
+import time
+from functools import wraps
+
+from flask import g, has_app_context, has_request_context, session
+from flask_sqlalchemy import SignallingSession, SQLAlchemy, get_state
+from sqlalchemy import event, orm
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(SignallingSession):
+    def __init__(self, db, **options):
+        super().__init__(db, **options)
+        self.wrote = False
+        event.listen(self, 'after_flush', self._mark_written)
+        event.listen(self, 'after_commit', self._pin_to_primary)
+        event.listen(self, 'after_rollback', self._reset)
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._use_replica(clause):
+            return get_state(self.app).db.get_engine(self.app, bind=REPLICA_BIND)
+        return super().get_bind(mapper, clause)
+
+    def _use_replica(self, clause):
+        if REPLICA_BIND not in (self.app.config.get('SQLALCHEMY_BINDS') or {}):
+            return False
+        if not (has_app_context() and g.get('read_replica')):
+            return False
+        if self.wrote or self._flushing or self.new or self.dirty or self.deleted:
+            return False
+        if getattr(clause, 'is_dml', False):
+            return False
+        if has_request_context() and session.get('primary_until', 0) > time.time():
+            return False
+        return True
+
+    def _mark_written(self, session_, flush_context):
+        self.wrote = True
+
+    def execute(self, statement, *args, **kwargs):
+        if getattr(statement, 'is_dml', False):
+            self.wrote = True
+        return super().execute(statement, *args, **kwargs)
+
+    def _pin_to_primary(self, session_):
+        if self.wrote and has_request_context():
+            session['primary_until'] = time.time() + self.app.config.get('REPLICA_LAG_SECONDS', 60)
+        self.wrote = False
+
+    def _reset(self, session_):
+        self.wrote = False
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+def read_replica(view):
+    """Run a view's queries on the replica when one is configured."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def configure_replica(app):
+    url = app.config.get('REPLICA_DATABASE_URL')
+    if url:
+        app.config.setdefault('SQLALCHEMY_BINDS', {})[REPLICA_BIND] = url
+
+
+def sync_sqlite_replica(db, app):
+    """Copy the primary SQLite database over the replica with the online backup API."""
+    primary = db.get_engine(app)
+    replica = db.get_engine(app, bind=REPLICA_BIND)
+    if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+        raise RuntimeError('replica-sync only copies SQLite databases; use database replication for servers')
+    source = primary.raw_connection()
+    target = replica.raw_connection()
+    try:
+        source.connection.backup(target.connection)
+    finally:
+        target.close()
+        source.close()
@@ -0,0 +1,101 @@
+"""Student search backed by an SQLite FTS5 index, with an ilike fallback.
+
+The student_fts table is an external-content FTS5 index over the student
+table, created by migration 2 and kept in sync by triggers, so rows written
+through bulk inserts or raw SQL are indexed too.
+
+Whether the index exists is probed once per database and remembered. A
+missing index is probed again after FTS_PROBE_TTL seconds, so workers started
+before `flask db-upgrade` switch to it without a restart.
+"""
+import re
+import time
+
+from sqlalchemy import text
+
+from models import db, Student
+
+FTS_COLUMNS = (
+    'first_name', 'last_name', 'father_name', 'mother_name',
+    'phone', 'email', 'enrollment_number',
+)
+
+DEFAULT_LIMIT = 50
+FTS_PROBE_TTL = 60
+
+# engine url -> (index present, monotonic time to probe again or None)
+_fts_enabled = {}
+
+
+def fts_supported(connection):
+    if connection.dialect.name != 'sqlite':
+        return False
+    return bool(connection.execute(
+        text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    ).scalar())
+
+
+def create_fts_index(connection):
+    """Create the FTS5 table and its sync triggers, then index existing rows."""
+    columns = ', '.join(FTS_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in FTS_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in FTS_COLUMNS)
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5("
+        f"{columns}, content='student', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS student_fts_insert AFTER INSERT ON student BEGIN "
+        f"INSERT INTO student_fts(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS student_fts_delete AFTER DELETE ON student BEGIN "
+        f"INSERT INTO student_fts(student_fts, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); END",
+        # Fee updates do not touch indexed columns, so they skip the trigger
+        f"CREATE TRIGGER IF NOT EXISTS student_fts_update AFTER UPDATE OF {columns} ON student BEGIN "
+        f"INSERT INTO student_fts(student_fts, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO student_fts(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        "INSERT INTO student_fts(student_fts) VALUES ('rebuild')",
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+    _fts_enabled.clear()
+
+
+def fts_enabled():
+    engine = db.engine
+    enabled, probe_at = _fts_enabled.get(engine.url, (False, 0.0))
+    if probe_at is not None and time.monotonic() >= probe_at:
+        with engine.connect() as connection:
+            enabled = connection.dialect.name == 'sqlite' and bool(connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'student_fts'")
+            ).scalar())
+        _fts_enabled[engine.url] = (enabled, None if enabled else time.monotonic() + FTS_PROBE_TTL)
+    return enabled
+
+
+def match_expression(term):
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    words = re.findall(r'\w+', term)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_students(term, limit=DEFAULT_LIMIT):
+    """Return up to limit students matching term, best match first."""
+    if fts_enabled():
+        expression = match_expression(term)
+        if not expression:
+            return []
+        statement = text(
+            'SELECT student.* FROM student_fts '
+            'JOIN student ON student.id = student_fts.rowid '
+            'WHERE student_fts MATCH :expression '
+            'ORDER BY student_fts.rank LIMIT :limit'
+        )
+        return db.session.query(Student).from_statement(statement).params(
+            expression=expression, limit=limit
+        ).all()
+
+    return Student.query.filter(
+        (Student.first_name.ilike(f'%{term}%')) |
+        (Student.last_name.ilike(f'%{term}%'))
+    ).limit(limit).all()
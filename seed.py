@@ -0,0 +1,198 @@
+"""Deterministic sample data: the default admin, the course catalogue and
+any number of generated students with their payments.
+
+Students are generated in batches and written with executemany under relaxed
+SQLite durability settings, so a million rows take seconds rather than the
+hours the one-ORM-object-per-student loop needed. The same seed always
+and as-of date produce the same dataset, which makes it the fixture for the
+benchmarks.
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, time as day_time, timedelta
+
+from sqlalchemy import event, func, select
+
+from models import db, Admin, Course, Payment, Student
+from enrollment import format_enrollment_number, reserve_numbers
+from passwords import hash_password
+import summary
+
+DEFAULT_BATCH_SIZE = 10000
+
+COURSES = [
+    ('B.Tech Computer Science', '4 years', 90000),
+    ('B.Tech Artificial Intelligence & Data Science', '4 years', 65000),
+    ('B.Tech Information Technology', '4 years', 45000),
+    ('B.Tech Electronics', '4 years', 40000),
+    ('B.Tech Mechanical', '4 years', 35000),
+    ('B.Tech Civil', '4 years', 30000),
+    ('M.Tech Computer Science', '2 years', 60000),
+    ('M.Tech Information Technology', '2 years', 55000),
+    ('M.Tech Electronics', '2 years', 50000),
+    ('M.Tech Mechanical', '2 years', 45000),
+    ('M.Tech Civil', '2 years', 40000),
+]
+
+FIRST_NAMES = ['Aarav', 'Aditya', 'Aisha', 'Akash', 'Amit', 'Ananya', 'Anjali', 'Arjun', 'Arun', 'Ashish',
+               'Bhavya', 'Chandra', 'Deepak', 'Divya', 'Esha', 'Gaurav', 'Geeta', 'Harsh', 'Indira', 'Jatin',
+               'Kavita', 'Lakshmi', 'Madhav', 'Neha', 'Om', 'Pooja', 'Rahul', 'Ravi', 'Sanjay', 'Tara',
+               'Uma', 'Vikram', 'Yash', 'Zara', 'Aryan', 'Bharat', 'Chitra', 'Dinesh', 'Elena', 'Firoz',
+               'Gita', 'Hari', 'Isha', 'Jaya', 'Krishna', 'Lata', 'Mohan', 'Nisha', 'Omar', 'Priya']
+
+LAST_NAMES = ['Sharma', 'Verma', 'Patel', 'Singh', 'Kumar', 'Gupta', 'Chauhan', 'Reddy', 'Pandey', 'Mishra',
+              'Agarwal', 'Malhotra', 'Joshi', 'Iyer', 'Menon', 'Nair', 'Pillai', 'Rao', 'Sastry', 'Tiwari',
+              'Varma', 'Yadav', 'Zachariah', 'Acharya', 'Bhat', 'Chakraborty', 'Das', 'Eswar', 'Fernandes',
+              'Ganguly', 'Hegde', 'Iyengar', 'Jain', 'Krishna', 'Lal', 'Mehta', 'Nambiar', 'Ojha', 'Prakash',
+              'Rajan', 'Saxena', 'Tandon', 'Uppal', 'Vaidya', 'Wadhwa', 'Xavier', 'Yadav', 'Zachariah']
+
+
+def seed_admin(username='admin', password='admin123'):
+    """Create the default admin if there is none; returns True if created."""
+    if Admin.query.first():
+        return False
+    db.session.add(Admin(username=username, password_hash=hash_password(password)))
+    db.session.commit()
+    return True
+
+
+def seed_courses():
+    """Create the course catalogue if there are no courses; returns True if created."""
+    if Course.query.first():
+        return False
+    db.session.add_all([
+        Course(name=name, duration=duration, total_fees=total_fees)
+        for name, duration, total_fees in COURSES
+    ])
+    db.session.commit()
+    return True
+
+
+@contextmanager
+def bulk_load_pragmas(engine):
+    """Trade durability for speed on SQLite connections opened inside the block."""
+    if engine.dialect.name != 'sqlite':
+        yield
+        return
+
+    def tune(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA synchronous = OFF')
+        cursor.execute('PRAGMA temp_store = MEMORY')
+        cursor.execute('PRAGMA cache_size = -65536')
+        cursor.close()
+
+    event.listen(engine, 'connect', tune)
+    engine.dispose()
+    try:
+        yield
+    finally:
+        event.remove(engine, 'connect', tune)
+        engine.dispose()
+
+
+def generate_students(count, courses, rng, as_of):
+    """Return count student rows without enrollment numbers, admitted over the last four intakes."""
+    # Intakes start in July; the latest one is this year's once July has begun
+    year = as_of.year if as_of >= date(as_of.year, 7, 1) else as_of.year - 1
+    course_ids = [course_id for course_id, _ in courses]
+    fees = dict(courses)
+    first_names = rng.choices(FIRST_NAMES, k=count)
+    last_names = rng.choices(LAST_NAMES, k=count)
+    chosen_courses = rng.choices(course_ids, k=count)
+    genders = rng.choices(['Male', 'Female'], k=count)
+    admission_years = rng.choices(range(year - 3, year + 1), k=count)
+    rows = []
+    for i in range(count):
+        first_name, last_name, course_id = first_names[i], last_names[i], chosen_courses[i]
+        admission_date = min(date(admission_years[i], 7, 1) + timedelta(days=rng.randrange(60)), as_of)
+        total_fees = float(fees[course_id])
+        if rng.random() < 0.3:  # 30% chance of a 5-25% discount
+            total_fees = float(int(total_fees * (1 - rng.randint(5, 25) / 100)))
+        paid_fees = float(rng.randint(0, int(total_fees)))
+        rows.append({
+            'first_name': first_name,
+            'last_name': last_name,
+            'date_of_birth': admission_date - timedelta(days=rng.randint(18 * 365, 25 * 365)),
+            'gender': genders[i],
+            'father_name': f"{rng.choice(FIRST_NAMES)} {last_name}",
+            'mother_name': f"{rng.choice(FIRST_NAMES)} {last_name}",
+            'address': f"{rng.randint(1, 999)}, Sector {rng.randint(1, 60)}",
+            'phone': f"+91{rng.randint(6000000000, 9999999999)}",
+            'admission_date': admission_date,
+            'course_id': course_id,
+            'total_fees': total_fees,
+            'paid_fees': paid_fees,
+            'remaining_fees': total_fees - paid_fees,
+        })
+    return rows
+
+
+def generate_payments(rows, student_ids, rng, as_of):
+    """Split each student's paid_fees into one to three installments dated up to as_of."""
+    payments = []
+    for row in rows:
+        paid = int(row['paid_fees'])
+        if not paid:
+            continue
+        installments = min(rng.randint(1, 3), paid)
+        cuts = sorted(rng.sample(range(1, paid), installments - 1)) if installments > 1 else []
+        paid_on = datetime.combine(row['admission_date'], day_time(10))
+        spacing = (as_of - row['admission_date']).days // installments
+        for low, high in zip([0] + cuts, cuts + [paid]):
+            paid_on += timedelta(days=rng.randint(0, spacing), minutes=rng.randint(0, 420))
+            payments.append({
+                'student_id': student_ids[row['enrollment_number']],
+                'amount': float(high - low),
+                'paid_at': paid_on,
+            })
+    return payments
+
+
+def _number_rows(rows):
+    # Enrollment numbers follow the admission year; reserve one block per year
+    by_year = {}
+    for row in rows:
+        by_year.setdefault(row['admission_date'].year, []).append(row)
+    for year, year_rows in sorted(by_year.items()):
+        for row, number in zip(year_rows, reserve_numbers(len(year_rows), year)):
+            row['enrollment_number'] = format_enrollment_number(year, number)
+            row['email'] = f"{row['first_name'].lower()}.{row['enrollment_number'].lower()}@example.com"
+
+
+def seed_students(count, seed=42, as_of=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Generate and insert count students with their payment history.
+
+    Nothing is dated after as_of (default today); the same seed and as_of
+    always produce the same rows. Returns the number of seconds taken.
+    """
+    rng = random.Random(seed)
+    as_of = as_of or date.today()
+    courses = db.session.query(Course.id, Course.total_fees).order_by(Course.id).all()
+    if not courses:
+        raise RuntimeError('Seed the courses before the students')
+
+    start = time.perf_counter()
+    engine = db.engine
+    insert_students = Student.__table__.insert()
+    insert_payments = Payment.__table__.insert()
+    with bulk_load_pragmas(engine):
+        done = 0
+        while done < count:
+            rows = generate_students(min(batch_size, count - done), courses, rng, as_of)
+            _number_rows(rows)
+            with engine.begin() as connection:
+                last_id = connection.execute(select(func.max(Student.id))).scalar() or 0
+                connection.execute(insert_students, rows)
+                summary.apply_students(rows, connection=connection)
+                student_ids = dict(connection.execute(
+                    select(Student.enrollment_number, Student.id).where(Student.id > last_id)
+                ).all())
+                payments = generate_payments(rows, student_ids, rng, as_of)
+                if payments:
+                    connection.execute(insert_payments, payments)
+            done += len(rows)
+            if progress:
+                progress(done)
+    return time.perf_counter() - start
@@ -0,0 +1,100 @@
+"""Dashboard statistics computed in a single query and cached in-process.
+
+The cache is per worker process. Write paths either adjust the cached totals
+in place or invalidate them, and the TTL bounds how stale another worker's
+copy can get. Each of those bumps a generation, and a value computed while
+one happened is returned but not cached. The cache is shared by every user
+of the process, so it is always filled from the primary, never a replica.
+"""
+import threading
+import time
+
+from flask import g, has_app_context
+from sqlalchemy import func
+
+from models import db, Course, CourseFeeSummary
+from money import rupees
+
+
+class DashboardStats:
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.adjustments = 0
+        self._lock = threading.Lock()
+        self._value = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def init_app(self, app):
+        self.ttl = app.config.get('DASHBOARD_STATS_TTL', self.ttl)
+
+    def get(self):
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                self.hits += 1
+                return dict(self._value)
+            self.misses += 1
+            generation = self._generation
+
+        replica = g.pop('read_replica', None) if has_app_context() else None
+        try:
+            value = self._compute()
+        finally:
+            if replica is not None:
+                g.read_replica = replica
+        with self._lock:
+            # A write committed while computing; the next request recomputes
+            if self._generation == generation:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl
+        return dict(value)
+
+    def _compute(self):
+        # One round trip over the per-course summary rows, O(courses) not O(students)
+        row = db.session.query(
+            func.count(Course.id),
+            func.coalesce(func.sum(CourseFeeSummary.student_count), 0),
+            func.coalesce(func.sum(CourseFeeSummary.total_paid), 0),
+            func.coalesce(func.sum(CourseFeeSummary.total_remaining), 0),
+        ).select_from(Course).outerjoin(
+            CourseFeeSummary, CourseFeeSummary.course_id == Course.id
+        ).one()
+        return {
+            'total_students': row[1],
+            'total_courses': row[0],
+            'total_fees_collected': row[2],
+            'total_fees_pending': row[3],
+        }
+
+    def adjust(self, students=0, courses=0, collected=0, pending=0):
+        """Apply a committed write to the cached totals without a re-query."""
+        with self._lock:
+            self._generation += 1
+            if self._value is None:
+                return
+            self.adjustments += 1
+            self._value['total_students'] += students
+            self._value['total_courses'] += courses
+            self._value['total_fees_collected'] = rupees(self._value['total_fees_collected'] + collected)
+            self._value['total_fees_pending'] = rupees(self._value['total_fees_pending'] + pending)
+
+    def invalidate(self):
+        with self._lock:
+            self.invalidations += 1
+            self._generation += 1
+            self._value = None
+            self._expires_at = 0.0
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'adjustments': self.adjustments,
+                'ttl': self.ttl,
+                'cached': self._value is not None,
+            }
@@ -0,0 +1,227 @@
+"""Student admission, lookup, editing and bulk import."""
+import csv
+from datetime import datetime
+
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for
+from flask_login import login_required
+
+from models import db, Course, Student
+from extensions import dashboard_stats, page_cache
+from enrollment import generate_enrollment_number
+from importer import DEFAULT_BATCH_SIZE, import_students
+from listing import DEFAULT_PER_PAGE, clamp_per_page, students_by_course
+from routing import read_replica
+from search import search_students
+import money
+import summary
+
+bp = Blueprint('students', __name__)
+
+
+@bp.route('/add_student', methods=['GET', 'POST'])
+@login_required
+def add_student():
+    if request.method == 'POST':
+        try:
+            course_id = request.form.get('course_id')
+            enrollment_number = request.form.get('enrollment_number')
+            
+            if not course_id:
+                flash('Please select a course', 'danger')
+                return redirect(url_for('students.add_student'))
+
+            if not enrollment_number:
+                # Allocate the next number for the year when none was entered
+                enrollment_number = generate_enrollment_number()
+
+            # Check if enrollment number already exists
+            existing_student = Student.query.filter_by(enrollment_number=enrollment_number).first()
+            if existing_student:
+                flash('Enrollment number already exists! Please use a different number.', 'danger')
+                return redirect(url_for('students.add_student'))
+
+            course = Course.query.get(course_id)
+            if not course:
+                flash('Invalid course selected', 'danger')
+                return redirect(url_for('students.add_student'))
+
+            # Calculate fees with discount
+            discount = float(request.form.get('discount', 0))
+            total_fees = money.discounted(course.total_fees, discount)
+
+            student = Student(
+                enrollment_number=enrollment_number,
+                first_name=request.form['first_name'],
+                last_name=request.form['last_name'],
+                date_of_birth=datetime.strptime(request.form['date_of_birth'], '%Y-%m-%d').date(),
+                gender=request.form['gender'],
+                father_name=request.form['father_name'],
+                mother_name=request.form['mother_name'],
+                address=request.form['address'],
+                phone=request.form['phone'],
+                email=request.form['email'],
+                admission_date=datetime.now().date(),
+                course_id=course_id,
+                total_fees=total_fees,
+                remaining_fees=total_fees
+            )
+            db.session.add(student)
+            db.session.flush()
+            # Read before commit expires them, which would cost two reloads
+            student_id, course_id = student.id, course.id
+            summary.apply_delta(course_id, students=1, billed=total_fees, remaining=total_fees)
+            db.session.commit()
+            dashboard_stats.adjust(students=1, pending=total_fees)
+            page_cache.student_changed(student_id, course_id)
+            flash(f'Student added successfully! Enrollment Number: {enrollment_number}', 'success')
+            return redirect(url_for('dashboard.dashboard'))
+        except Exception as e:
+            current_app.logger.exception('Error adding student')
+            flash(f'Error adding student: {str(e)}', 'danger')
+            db.session.rollback()
+            return redirect(url_for('students.add_student'))
+    
+    courses = Course.query.all()
+    return render_template('add_student.html', courses=courses)
+
+@bp.route('/import_students', methods=['POST'])
+@login_required
+def import_students_upload():
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'error': 'Please upload a CSV or .xlsx file'}), 400
+    batch_size = request.form.get('batch_size', DEFAULT_BATCH_SIZE, type=int)
+    try:
+        result = import_students(upload.stream, filename=upload.filename,
+                                 batch_size=max(batch_size, 1))
+    except (RuntimeError, UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        dashboard_stats.invalidate()
+        page_cache.students_changed()
+    return jsonify(result.as_dict())
+
+@bp.route('/search_student', methods=['GET', 'POST'])
+@login_required
+@read_replica
+def search_student():
+    enrollment_number = request.args.get('enrollment_number') or request.form.get('enrollment_number')
+    name = request.args.get('name') or request.form.get('name')
+    
+    if enrollment_number:
+        student = Student.query.filter_by(enrollment_number=enrollment_number).first()
+        if student:
+            return render_template('student_details.html', student=student)
+        flash('Student not found!')
+    elif name:
+        # Search by name, parents' names, phone, email or enrollment number
+        students = search_students(name, limit=current_app.config['SEARCH_RESULT_LIMIT'])
+        
+        if students:
+            if len(students) == 1:
+                # If only one student found, show details directly
+                return render_template('student_details.html', student=students[0])
+            else:
+                # If multiple students found, show list
+                return render_template('search_results.html', students=students, search_term=name)
+        else:
+            flash('No students found with that name!')
+    elif request.method == 'POST':
+        flash('Please enter an enrollment number or name')
+    
+    return render_template('search_student.html')
+
+@bp.route('/view_students')
+@login_required
+@read_replica
+@page_cache.cached(lambda: [('students', 0)])
+def view_students():
+    # Courses with one page of their students each, loaded in two queries
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', DEFAULT_PER_PAGE, type=int)
+    courses = students_by_course(page=page, per_page=per_page)
+    return render_template('view_students.html', courses=courses, page=page,
+                           per_page=clamp_per_page(per_page))
+
+@bp.route('/student_details/<int:student_id>')
+@login_required
+@page_cache.cached(lambda student_id: [('student', student_id)])
+def student_details(student_id):
+    student = Student.query.get_or_404(student_id)
+    return render_template('student_details.html', student=student)
+
+@bp.route('/update_student/<int:student_id>', methods=['GET', 'POST'])
+@login_required
+def update_student(student_id):
+    student = Student.query.get_or_404(student_id)
+    
+    if request.method == 'POST':
+        try:
+            previous = summary.student_values(student)
+            previous_remaining = student.remaining_fees
+            previous_course_id = student.course_id
+
+            # Update student information
+            student.first_name = request.form['first_name']
+            student.last_name = request.form['last_name']
+            student.date_of_birth = datetime.strptime(request.form['date_of_birth'], '%Y-%m-%d').date()
+            student.gender = request.form['gender']
+            student.father_name = request.form['father_name']
+            student.mother_name = request.form['mother_name']
+            student.address = request.form['address']
+            student.phone = request.form['phone']
+            student.email = request.form['email']
+            
+            # Update course if changed
+            if request.form.get('course_id'):
+                course_id = int(request.form['course_id'])
+                if course_id != student.course_id:
+                    course = Course.query.get(course_id)
+                    if course:
+                        student.course_id = course_id
+                        student.total_fees = course.total_fees
+                        student.remaining_fees = student.total_fees - student.paid_fees
+                        # Move the student's totals to the new course in the same transaction
+                        summary.apply_students([previous], sign=-1)
+                        summary.apply_students([summary.student_values(student)])
+            
+            # Read before the commit expires the student, which would cost a reload
+            remaining_fees, new_course_id = student.remaining_fees, student.course_id
+            db.session.commit()
+            dashboard_stats.adjust(pending=remaining_fees - previous_remaining)
+            page_cache.student_changed(student_id, previous_course_id, new_course_id)
+            flash('Student information updated successfully!', 'success')
+            return redirect(url_for('students.student_details', student_id=student_id))
+            
+        except Exception as e:
+            flash(f'Error updating student: {str(e)}', 'danger')
+            db.session.rollback()
+    
+    courses = Course.query.all()
+    return render_template('update_student.html', student=student, courses=courses)
+
+@bp.route('/delete_student/<int:student_id>', methods=['POST'])
+@login_required
+def delete_student(student_id):
+    try:
+        student = Student.query.get_or_404(student_id)
+        paid_fees, remaining_fees = student.paid_fees or 0, student.remaining_fees
+        course_id = student.course_id
+        summary.apply_students([summary.student_values(student)], sign=-1)
+        db.session.delete(student)
+        db.session.commit()
+        dashboard_stats.adjust(students=-1, collected=-paid_fees, pending=-remaining_fees)
+        page_cache.student_changed(student_id, course_id)
+        flash('Student deleted successfully!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error deleting student: {str(e)}', 'danger')
+    return redirect(url_for('dashboard.dashboard'))
+
+@bp.route('/student_report/<int:student_id>')
+@login_required
+@page_cache.cached(lambda student_id: [('student', student_id)])
+def student_report(student_id):
+    student = Student.query.get_or_404(student_id)
+    return render_template('student_report.html', student=student)
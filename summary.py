@@ -0,0 +1,133 @@
+"""Per-course fee totals kept in the course_fee_summary table.
+
+Every write path adjusts the affected course rows in the same transaction
+as the student change, so dashboards read one row per course instead of
+aggregating the Student table. rebuild() recomputes the table from scratch
+and check() reports any course whose totals have drifted. Totals are integer
+paise, so a correct row matches the aggregate exactly.
+"""
+from sqlalchemy import event, func, select
+
+from models import db, Course, CourseFeeSummary, Student
+from money import to_paise, to_rupees
+
+summaries = CourseFeeSummary.__table__
+
+
+@event.listens_for(Course, 'after_insert')
+def _create_summary_row(mapper, connection, course):
+    connection.execute(summaries.insert().values(course_id=course.id))
+
+
+def apply_delta(course_id, students=0, billed=0, paid=0, remaining=0, connection=None):
+    executor = connection if connection is not None else db.session
+    updated = executor.execute(
+        summaries.update()
+        .where(summaries.c.course_id == course_id)
+        .values(student_count=summaries.c.student_count + students,
+                total_billed=summaries.c.total_billed + billed,
+                total_paid=summaries.c.total_paid + paid,
+                total_remaining=summaries.c.total_remaining + remaining)
+    ).rowcount
+    if not updated:
+        executor.execute(summaries.insert().values(
+            course_id=course_id, student_count=students, total_billed=billed,
+            total_paid=paid, total_remaining=remaining))
+
+
+def apply_payment(student_id, amount, connection=None):
+    """Move amount from remaining to paid on the student's course row."""
+    executor = connection if connection is not None else db.session
+    course_id = select(Student.course_id).where(Student.id == student_id).scalar_subquery()
+    executor.execute(
+        summaries.update()
+        .where(summaries.c.course_id == course_id)
+        .values(total_paid=summaries.c.total_paid + amount,
+                total_remaining=summaries.c.total_remaining - amount)
+    )
+
+
+def apply_students(rows, sign=1, connection=None):
+    """Add (sign=1) or remove (sign=-1) student mappings, one UPDATE per course."""
+    deltas = {}
+    for row in rows:
+        # Summed in paise so many rows add up without float rounding
+        delta = deltas.setdefault(row['course_id'], [0, 0, 0, 0])
+        delta[0] += sign
+        delta[1] += sign * to_paise(row['total_fees'])
+        delta[2] += sign * to_paise(row.get('paid_fees') or 0)
+        delta[3] += sign * to_paise(row['remaining_fees'])
+    for course_id, (students, billed, paid, remaining) in deltas.items():
+        apply_delta(course_id, students, to_rupees(billed), to_rupees(paid), to_rupees(remaining),
+                    connection=connection)
+
+
+def student_values(student):
+    return {
+        'course_id': student.course_id,
+        'total_fees': student.total_fees,
+        'paid_fees': student.paid_fees or 0,
+        'remaining_fees': student.remaining_fees,
+    }
+
+
+def aggregate_query():
+    return select(
+        Course.id.label('course_id'),
+        func.count(Student.id).label('student_count'),
+        func.coalesce(func.sum(Student.total_fees), 0).label('total_billed'),
+        func.coalesce(func.sum(Student.paid_fees), 0).label('total_paid'),
+        func.coalesce(func.sum(Student.remaining_fees), 0).label('total_remaining'),
+    ).select_from(Course).outerjoin(Student, Student.course_id == Course.id).group_by(Course.id)
+
+
+def rebuild(connection=None):
+    """Recompute every course row from the Student table; returns the number of courses."""
+    executor = connection if connection is not None else db.session
+    executor.execute(summaries.delete())
+    query = aggregate_query()
+    executor.execute(summaries.insert().from_select(
+        ['course_id', 'student_count', 'total_billed', 'total_paid', 'total_remaining'], query
+    ))
+    return executor.execute(select(func.count()).select_from(summaries)).scalar()
+
+
+def refresh(course_ids, connection=None):
+    """Recompute the rows of the given courses after a set-based change to their students."""
+    course_ids = list(course_ids)
+    if not course_ids:
+        return
+    executor = connection if connection is not None else db.session
+    executor.execute(summaries.delete().where(summaries.c.course_id.in_(course_ids)))
+    executor.execute(summaries.insert().from_select(
+        ['course_id', 'student_count', 'total_billed', 'total_paid', 'total_remaining'],
+        aggregate_query().where(Course.id.in_(course_ids))
+    ))
+
+
+def check():
+    """Return a list of (course_id, column, stored, actual) for every mismatch."""
+    stored = {row.course_id: row for row in db.session.execute(select(summaries))}
+    mismatches = []
+    for actual in db.session.execute(aggregate_query()):
+        row = stored.pop(actual.course_id, None)
+        for column in ('student_count', 'total_billed', 'total_paid', 'total_remaining'):
+            value = getattr(row, column) if row is not None else None
+            if value is None or value != getattr(actual, column):
+                mismatches.append((actual.course_id, column, value, getattr(actual, column)))
+    for course_id in stored:
+        mismatches.append((course_id, 'course_id', course_id, None))
+    return mismatches
+
+
+def course_summaries():
+    """All courses with their fee totals, one row per course."""
+    return db.session.query(
+        Course.id,
+        Course.name,
+        Course.total_fees,
+        func.coalesce(CourseFeeSummary.student_count, 0).label('student_count'),
+        func.coalesce(CourseFeeSummary.total_billed, 0).label('total_billed'),
+        func.coalesce(CourseFeeSummary.total_paid, 0).label('total_paid'),
+        func.coalesce(CourseFeeSummary.total_remaining, 0).label('total_remaining'),
+    ).outerjoin(CourseFeeSummary, CourseFeeSummary.course_id == Course.id).order_by(Course.id).all()
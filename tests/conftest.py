@@ -0,0 +1,83 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from app import create_app
+from models import db, Admin, Course, Student
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """A test client logged in as an admin."""
+    admin = Admin(username='admin', password_hash='-')
+    db.session.add(admin)
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(admin.id)
+        session['_fresh'] = True
+    return client
+
+
+@pytest.fixture
+def add_courses(app):
+    """add_courses(courses, students_per_course) adds courses with a 1000 fee, each with unpaid students."""
+    def add(courses, students_per_course):
+        for i in range(courses):
+            course = Course(name=f'Course {i}', duration='4 years', total_fees=1000)
+            db.session.add(course)
+            db.session.flush()
+            db.session.bulk_insert_mappings(Student, [{
+                'enrollment_number': f'E{course.id:03d}{n:04d}',
+                'first_name': 'First',
+                'last_name': 'Last',
+                'date_of_birth': date(2000, 1, 1),
+                'gender': 'Female',
+                'father_name': 'Father',
+                'mother_name': 'Mother',
+                'address': 'Address',
+                'phone': '1',
+                'email': f's{course.id}.{n}@example.com',
+                'admission_date': date(2026, 1, 1),
+                'course_id': course.id,
+                'total_fees': 1000,
+                'paid_fees': 0,
+                'remaining_fees': 1000,
+            } for n in range(students_per_course)])
+        db.session.commit()
+    return add
+
+
+@pytest.fixture
+def count_queries(app):
+    """count_queries(func) runs func and returns how many statements it sent to the database."""
+    def count(func):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            func()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return len(statements)
+    return count
@@ -0,0 +1,32 @@
+import pytest
+
+from bulk_fees import apply_discount, post_payment_batch
+
+
+@pytest.mark.parametrize('limit', ['-1', '0'])
+def test_search_limit_is_at_least_one(app, client, limit, add_courses):
+    add_courses(1, 5)
+    response = client.get(f'/api/v1/search?q=First&limit={limit}')
+    assert response.status_code == 200
+    assert len(response.get_json()['students']) == 1
+
+
+def test_search_limit_is_capped(app, client, add_courses):
+    app.config['SEARCH_RESULT_LIMIT'] = 3
+    add_courses(1, 5)
+    response = client.get('/api/v1/search?q=First&limit=100')
+    assert len(response.get_json()['students']) == 3
+
+
+def test_fee_status_revalidates_after_discount(app, client, add_courses):
+    add_courses(1, 1)
+    post_payment_batch([(2, {'enrollment_number': 'E0010000', 'amount': '100'})])
+    first = client.get('/api/v1/students/1/fees')
+    assert first.get_json()['payments'] == 1
+    assert 'Last-Modified' not in first.headers
+    assert client.get('/api/v1/students/1/fees', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    apply_discount(50, student_ids=[1])
+    response = client.get('/api/v1/students/1/fees', headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+    assert response.status_code == 200
+    assert response.get_json()['remaining_fees'] == 400.0
@@ -0,0 +1,36 @@
+import threading
+
+from werkzeug.security import generate_password_hash
+
+from models import db, Admin
+import passwords
+
+
+def test_login_rehashes_in_the_password_pool(app, monkeypatch):
+    db.session.add(Admin(username='admin', password_hash=generate_password_hash('secret', 'pbkdf2:sha256:500')))
+    db.session.commit()
+    threads = []
+
+    def generate(password, method):
+        threads.append(threading.current_thread().name)
+        return generate_password_hash(password, method)
+    monkeypatch.setattr(passwords, 'generate_password_hash', generate)
+
+    response = app.test_client().post('/login', data={'username': 'admin', 'password': 'secret'})
+    assert response.status_code == 302
+    assert Admin.query.one().password_hash.startswith(f'pbkdf2:sha256:{app.config["PASSWORD_HASH_ITERATIONS"]}$')
+    assert len(threads) == 1 and threads[0].startswith('password')
+
+
+def test_login_succeeds_when_the_rehash_is_busy(app, monkeypatch):
+    old_hash = generate_password_hash('secret', 'pbkdf2:sha256:500')
+    db.session.add(Admin(username='admin', password_hash=old_hash))
+    db.session.commit()
+
+    def busy(password):
+        raise passwords.LoginBusy('Too many logins in progress')
+    monkeypatch.setattr(app.extensions['password_hasher'], 'hash', busy)
+
+    response = app.test_client().post('/login', data={'username': 'admin', 'password': 'secret'})
+    assert response.status_code == 302
+    assert Admin.query.one().password_hash == old_hash
@@ -0,0 +1,23 @@
+import io
+
+import pytest
+
+from models import db, Course
+
+
+@pytest.mark.parametrize('total_fees', ['nan', 'inf', '-inf', '-1'])
+def test_revise_course_rejects_invalid_fee(app, client, total_fees, add_courses):
+    add_courses(1, 1)
+    response = client.post('/fees/revise_course/1', data={'total_fees': total_fees})
+    assert response.status_code == 400
+    assert db.session.get(Course, 1).total_fees == 1000
+
+
+@pytest.mark.parametrize('amount', ['nan', 'inf'])
+def test_payment_batch_rejects_non_finite_amount(app, client, amount, add_courses):
+    add_courses(1, 1)
+    statement = f'enrollment_number,amount\nE0010000,{amount}\n'.encode()
+    response = client.post('/fees/reconcile', data={'file': (io.BytesIO(statement), 'statement.csv')})
+    assert response.status_code == 200
+    assert response.get_json()['errors'] == [{'line': 2, 'error': f'Invalid amount {amount!r}'}]
+    assert response.get_json()['changed'] == 0
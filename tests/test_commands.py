@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.mark.parametrize('batch_size', ['0', '-5'])
+def test_import_students_rejects_batch_size_below_one(app, tmp_path, batch_size):
+    path = tmp_path / 'students.csv'
+    path.write_text('first_name,last_name\n')
+    result = app.test_cli_runner().invoke(args=['import-students', str(path), '--batch-size', batch_size])
+    assert result.exit_code == 2
+    assert 'Imported' not in result.output
+
+
+def test_seed_rejects_batch_size_below_one(app):
+    result = app.test_cli_runner().invoke(args=['seed', '--students', '1', '--batch-size', '0'])
+    assert result.exit_code == 2
@@ -0,0 +1,31 @@
+from datetime import date
+
+from models import db, Student
+import fee_snapshot
+
+
+def test_snapshot_reloads_when_a_student_is_replaced(app, add_courses):
+    add_courses(1, 2)
+    assert fee_snapshot.current().row(1) is not None
+
+    # Same course, same fees: the per-course summary alone does not change
+    student = db.session.get(Student, 1)
+    db.session.delete(student)
+    db.session.flush()
+    db.session.add(Student(**{column: getattr(student, column) for column in (
+        'first_name', 'last_name', 'date_of_birth', 'gender', 'father_name', 'mother_name', 'address', 'phone',
+        'email', 'admission_date', 'course_id', 'total_fees', 'paid_fees', 'remaining_fees')},
+        enrollment_number='E0019999'))
+    db.session.commit()
+
+    snapshot = fee_snapshot.current()
+    assert snapshot.row(1) is None
+    assert snapshot.row(3) is not None
+
+
+def test_snapshot_reloads_when_an_admission_date_changes(app, add_courses):
+    add_courses(1, 2)
+    version = fee_snapshot.data_version()
+    db.session.get(Student, 1).admission_date = date(2025, 6, 1)
+    db.session.commit()
+    assert fee_snapshot.data_version() != version
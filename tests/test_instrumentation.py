@@ -0,0 +1,46 @@
+import pytest
+
+from app import create_app
+from config import TestingConfig
+from models import db, Admin
+
+
+@pytest.fixture
+def instrumented(monkeypatch):
+    monkeypatch.setattr(TestingConfig, 'INSTRUMENTATION_ENABLED', True)
+    monkeypatch.setattr(TestingConfig, 'METRICS_TOKEN', 'secret')
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def test_metrics_needs_a_token_or_login(instrumented):
+    assert instrumented.get('/metrics').status_code == 401
+    assert instrumented.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert instrumented.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+    admin = Admin(username='admin', password_hash='-')
+    db.session.add(admin)
+    db.session.commit()
+    with instrumented.session_transaction() as session:
+        session['_user_id'] = str(admin.id)
+    assert instrumented.get('/metrics').status_code == 200
+
+
+def test_request_duration_is_a_histogram(instrumented):
+    for _ in range(3):
+        instrumented.get('/api/v1/courses')
+    lines = instrumented.get('/metrics', headers={'Authorization': 'Bearer secret'}).get_data(as_text=True).splitlines()
+
+    assert '# TYPE http_request_duration_seconds histogram' in lines
+    labels = 'endpoint="api.courses",method="GET",status="302"'
+    buckets = [line for line in lines if line.startswith(f'http_request_duration_seconds_bucket{{{labels},')]
+    counts = [int(line.rsplit(' ', 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1] == f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3'
+    assert f'http_request_duration_seconds_count{{{labels}}} 3' in lines
+    assert any(line.startswith(f'http_request_duration_seconds_sum{{{labels}}} ') for line in lines)
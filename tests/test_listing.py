@@ -0,0 +1,31 @@
+from models import db
+from listing import students_by_course
+
+
+def test_students_by_course_query_count_is_independent_of_course_count(count_queries, add_courses):
+    add_courses(2, 3)
+    db.session.expire_all()
+    few = count_queries(lambda: students_by_course(per_page=2))
+
+    add_courses(10, 5)
+    db.session.expire_all()
+    groups = []
+    many = count_queries(lambda: groups.extend(students_by_course(per_page=2)))
+
+    assert len(groups) == 12
+    assert all(len(group.students) == 2 for group in groups)
+    assert many == few
+
+
+def test_students_by_course_pages_within_each_course(app, add_courses):
+    add_courses(3, 5)
+    groups = students_by_course(page=3, per_page=2)
+    assert [len(group.students) for group in groups] == [1, 1, 1]
+    assert all(group.pages == 3 and group.student_count == 5 for group in groups)
+
+
+def test_students_by_course_counts_courses_past_their_last_page(app, add_courses):
+    add_courses(1, 30)
+    add_courses(1, 5)
+    groups = students_by_course(page=2, per_page=25)
+    assert [(group.student_count, group.pages, len(group.students)) for group in groups] == [(30, 2, 5), (5, 1, 0)]
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.schema import CreateTable
+
+from models import db, Course
+import migrations
+import summary
+
+
+def legacy_course_table():
+    """Put the course table back as it was before fees were stored in paise."""
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP TABLE course'))
+        connection.execute(text(
+            'CREATE TABLE course (id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, '
+            'duration VARCHAR(50) NOT NULL, total_fees FLOAT NOT NULL, description TEXT, PRIMARY KEY (id))'
+        ))
+        connection.execute(text("INSERT INTO course (id, name, duration, total_fees) "
+                                "VALUES (1, 'B.Tech', '4 years', 45000.5)"))
+        connection.execute(text('CREATE VIEW course_fees AS SELECT id, total_fees FROM course'))
+        migrations._ensure_version_table(connection)
+        for version in range(1, 6):
+            connection.execute(text('INSERT INTO schema_version VALUES (:version, :version, :now)'),
+                               {'version': version, 'now': datetime.now()})
+
+
+def course_schema():
+    return db.session.execute(text("SELECT sql FROM sqlite_master WHERE name = 'course'")).scalar()
+
+
+def table_names():
+    return set(db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars())
+
+
+def test_failed_paise_migration_rolls_back(app, monkeypatch):
+    legacy_course_table()
+    before = course_schema(), table_names()
+
+    def fail(connection=None):
+        raise RuntimeError('interrupted')
+    monkeypatch.setattr(summary, 'rebuild', fail)
+    with pytest.raises(RuntimeError):
+        migrations.upgrade()
+
+    assert migrations.pending() == [6, 7]
+    assert (course_schema(), table_names()) == before
+    assert db.session.execute(text('SELECT total_fees FROM course_fees')).scalar() == 45000.5
+
+
+def test_paise_migration_matches_models(app):
+    legacy_course_table()
+    expected = ' '.join(str(CreateTable(Course.__table__).compile(dialect=db.engine.dialect)).split())
+
+    assert migrations.upgrade() == [6, 7]
+    assert ' '.join(course_schema().replace('"course"', 'course').split()) == expected
+    assert db.session.execute(text('SELECT total_fees FROM course_fees')).scalar() == 4500050
+    assert Course.query.get(1).total_fees == 45000.5
+    assert summary.check() == []
+
+
+def test_unused_name_indexes_are_dropped(app):
+    with db.engine.begin() as connection:
+        connection.execute(text('CREATE INDEX ix_student_first_name_lower ON student (lower(first_name))'))
+        migrations._ensure_version_table(connection)
+        for version in range(1, 7):
+            connection.execute(text('INSERT INTO schema_version VALUES (:version, :version, :now)'),
+                               {'version': version, 'now': datetime.now()})
+
+    assert migrations.upgrade() == [7]
+    assert not db.session.execute(text("SELECT name FROM sqlite_master WHERE name LIKE '%_lower'")).all()
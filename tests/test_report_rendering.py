@@ -0,0 +1,19 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import report_rendering
+
+
+def test_bounded_map_keeps_a_fixed_window_of_chunks():
+    pulled = []
+
+    def chunks():
+        for i in range(12):
+            pulled.append(i)
+            yield i
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=report_rendering._pool_context()) as pool:
+        results = [(result, len(pulled)) for result in report_rendering._bounded_map(pool, abs, chunks(), 3)]
+
+    assert [result for result, _ in results] == list(range(12))
+    # Each result is taken before more than the window of chunks has been read
+    assert all(read <= result + 3 for result, read in results)
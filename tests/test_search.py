@@ -0,0 +1,18 @@
+from models import db
+import search
+
+
+def test_fts_index_created_later_is_picked_up_after_the_probe_ttl(app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search.time, 'monotonic', lambda: now[0])
+    search._fts_enabled.clear()
+    assert not search.fts_enabled()
+
+    # Another process runs `flask db-upgrade`; this one has not seen it yet
+    with db.engine.begin() as connection:
+        connection.execute(db.text('CREATE VIRTUAL TABLE student_fts USING fts5(first_name)'))
+    assert not search.fts_enabled()
+
+    now[0] += search.FTS_PROBE_TTL
+    assert search.fts_enabled()
+    search._fts_enabled.clear()
@@ -0,0 +1,36 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median import time of the app in a fresh interpreter; override for slow CI machines
+STARTUP_BUDGET_MS = float(os.environ.get('STARTUP_BUDGET_MS', 1500))
+
+# Loaded by the first report, analytics or export request, never at start-up
+LAZY_MODULES = ('numpy', 'reportlab', 'openpyxl', 'pyarrow', 'analytics', 'report_rendering', 'fee_snapshot')
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from app import app
+print(json.dumps({
+    'import_ms': (time.perf_counter() - start) * 1000,
+    'loaded': [name for name in %r if name in sys.modules],
+}))
+''' % (LAZY_MODULES,)
+
+
+def probe():
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_app_import_is_within_budget_and_lazy():
+    probe()  # warm the bytecode cache
+    runs = [probe() for _ in range(3)]
+    assert [run['loaded'] for run in runs] == [[]] * len(runs)
+    assert statistics.median(run['import_ms'] for run in runs) < STARTUP_BUDGET_MS
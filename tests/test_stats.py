@@ -0,0 +1,37 @@
+from flask import g
+
+from stats import DashboardStats
+
+
+def test_totals_computed_across_a_write_are_not_cached(app, monkeypatch):
+    stats = DashboardStats()
+    compute = stats._compute
+
+    def compute_during_payment():
+        value = compute()
+        stats.adjust(collected=100, pending=-100)
+        return value
+    monkeypatch.setattr(stats, '_compute', compute_during_payment)
+
+    stats.get()
+    assert not stats.metrics()['cached']
+    monkeypatch.setattr(stats, '_compute', compute)
+    stats.get()
+    assert stats.metrics()['cached']
+
+
+def test_totals_are_computed_on_the_primary(app, monkeypatch):
+    stats = DashboardStats()
+    seen = []
+    compute = stats._compute
+
+    def record():
+        seen.append(g.get('read_replica'))
+        return compute()
+    monkeypatch.setattr(stats, '_compute', record)
+
+    with app.test_request_context():
+        g.read_replica = True
+        stats.get()
+        assert seen == [None]
+        assert g.read_replica is True